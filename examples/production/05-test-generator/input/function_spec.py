@@ -5,9 +5,27 @@ This module demonstrates how to write function specifications that can be
 automatically converted into comprehensive test suites.
 """
 
-from decimal import Decimal
+from decimal import Decimal, getcontext
+from functools import lru_cache
 from typing import Optional
 
+# Built once instead of on every call. The discount still divides by 100:
+# multiplying by Decimal('0.01') instead gives the result a different
+# exponent (Decimal('90.0000') rather than Decimal('90.000') for 100.00, 10).
+_HUNDRED = Decimal('100')
+
+# Tier bonuses (additional discount percentages)
+_TIER_BONUSES = {
+    'bronze': Decimal('2'),
+    'silver': Decimal('5'),
+    'gold': Decimal('5'),
+    'platinum': Decimal('10'),
+}
+
+# Argument types whose str() round-trips exactly through Decimal; only these
+# go through the result cache
+_CACHEABLE_TYPES = (Decimal, int)
+
 
 def calculate_discount(
     original_price: Decimal,
@@ -97,22 +115,61 @@ def calculate_discount(
         raise ValueError("Quantity must be at least 1")
 
     # Normalize and validate member tier
-    valid_tiers = {'bronze', 'silver', 'gold', 'platinum'}
-    tier_bonus = Decimal('0')
-
+    normalized_tier = None
     if member_tier is not None:
         normalized_tier = member_tier.strip().lower()
-        if normalized_tier not in valid_tiers:
+        if normalized_tier not in _TIER_BONUSES:
             raise ValueError("Invalid member tier")
 
-        # Tier bonuses (additional discount percentages)
-        tier_bonuses = {
-            'bronze': Decimal('2'),
-            'silver': Decimal('5'),
-            'gold': Decimal('5'),
-            'platinum': Decimal('10'),
-        }
-        tier_bonus = tier_bonuses[normalized_tier]
+    # Prices recur heavily in catalog pricing, so the arithmetic is cached.
+    # Decimals are keyed by their string form so that equal values with
+    # different exponents (e.g. 100 vs 100.00) keep distinct results. Other
+    # types are computed as given, so e.g. floats still raise TypeError.
+    # The active decimal context shapes the result, so it is part of the key.
+    if type(original_price) in _CACHEABLE_TYPES and type(discount_percent) in _CACHEABLE_TYPES:
+        ctx = getcontext()
+        context_key = (
+            ctx.prec,
+            ctx.rounding,
+            ctx.Emin,
+            ctx.Emax,
+            ctx.clamp,
+            frozenset(signal for signal, trapped in ctx.traps.items() if trapped),
+        )
+        return _calculate_discount_cached(
+            str(original_price), str(discount_percent), normalized_tier, quantity, context_key
+        )
+    return _calculate_discount_impl(original_price, discount_percent, normalized_tier, quantity)
+
+
+@lru_cache(maxsize=1024)
+def _calculate_discount_cached(
+    price_str: str,
+    percent_str: str,
+    normalized_tier: Optional[str],
+    quantity: int,
+    context_key: tuple,
+) -> Decimal:
+    """Cached _calculate_discount_impl for Decimal/int inputs keyed by str().
+
+    context_key only keys the cache on the decimal context the result was
+    computed under; the computation itself uses the active context.
+    """
+    return _calculate_discount_impl(
+        Decimal(price_str), Decimal(percent_str), normalized_tier, quantity
+    )
+
+
+def _calculate_discount_impl(
+    original_price: Decimal,
+    discount_percent: Decimal,
+    normalized_tier: Optional[str],
+    quantity: int,
+) -> Decimal:
+    """Compute the discounted price for already-validated inputs."""
+    tier_bonus = Decimal('0')
+    if normalized_tier is not None:
+        tier_bonus = _TIER_BONUSES[normalized_tier]
 
     # Quantity-based bulk discount
     bulk_discount = Decimal('0')
@@ -124,10 +181,10 @@ def calculate_discount(
     # Calculate total discount percentage
     total_discount_percent = discount_percent + tier_bonus + bulk_discount
     # Cap at 100%
-    total_discount_percent = min(total_discount_percent, Decimal('100'))
+    total_discount_percent = min(total_discount_percent, _HUNDRED)
 
     # Apply discount
-    discount_amount = original_price * (total_discount_percent / Decimal('100'))
+    discount_amount = original_price * (total_discount_percent / _HUNDRED)
     final_price = original_price - discount_amount
 
     # Ensure non-negative (should not happen with validation, but defensive)
@@ -8,12 +8,61 @@ format suitable for constraint-based test generation.
 """
 
 import ast
+import hashlib
 import json
+import os
+import pickle
+import re
 import sys
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Bump whenever the extraction logic or output format changes so stale
+# cache entries are ignored.
+CACHE_VERSION = 2
+CACHE_DIR = Path.home() / ".cache" / "test_generator"
+
+# A category header is any non-bullet line ending in ':'; a few well-known
+# docstring sections terminate the "Test Cases:" block instead.
+_CATEGORY_RE = re.compile(r'([^-].*):')
+_SECTION_STOP_RE = re.compile(r'(?:Examples|Note|Returns|See Also):')
+
+# Inputs inferred for error-condition descriptions, keyed by the phrase
+# that identifies them. The first phrase found in the description wins.
+_ERROR_INPUT_TEMPLATES = {
+    "negative price": {"original_price": "-100.00"},
+    "negative discount": {"original_price": "100.00", "discount_percent": "-10"},
+    "discount > 100": {"original_price": "100.00", "discount_percent": "150"},
+    "over 100": {"original_price": "100.00", "discount_percent": "150"},
+    "invalid tier": {
+        "original_price": "100.00",
+        "discount_percent": "10",
+        "member_tier": "invalid_tier",
+    },
+    "zero quantity": {"original_price": "100.00", "discount_percent": "10", "quantity": "0"},
+    "negative quantity": {"original_price": "100.00", "discount_percent": "10", "quantity": "-1"},
+}
+_ERROR_INPUT_RE = re.compile(
+    '|'.join(re.escape(phrase) for phrase in _ERROR_INPUT_TEMPLATES), re.IGNORECASE
+)
+
+# Exception types recognised in "Error Conditions" test case lines
+_ERROR_TYPE_RE = re.compile(r'\b(ValueError|TypeError|KeyError|AttributeError)\b')
+
+# One comma-separated input token, optionally of the form key=value, with
+# surrounding whitespace trimmed.
+_INPUT_TOKEN_RE = re.compile(
+    r'(?:^|,)\s*(?:(?P<key>[^,=]*?)\s*=\s*)?(?P<value>[^,]*?)\s*(?=,|$)'
+)
+
 
 @dataclass
 class TestCase:
@@ -40,23 +89,25 @@ class FunctionSpec:
 
 def extract_function_info(tree: ast.AST, source_file: str) -> Optional[FunctionSpec]:
     """Extract function signature and docstring from AST."""
-    for node in ast.walk(tree):
+    for node in _iter_candidate_functions(tree):
         if isinstance(node, ast.FunctionDef):
             # Find function with comprehensive docstring
             docstring = ast.get_docstring(node)
             if not docstring or "Test Cases:" not in docstring:
                 continue
 
-            # Extract function signature
+            # Extract function signature; parameters tend to repeat the same
+            # generic annotations, so share one cache across the signature
+            annotation_cache: Dict[str, str] = {}
             params = []
             for arg in node.args.args:
                 param_info = {
                     "name": arg.arg,
-                    "type": _get_type_annotation(arg.annotation),
+                    "type": _get_type_annotation(arg.annotation, annotation_cache),
                 }
                 params.append(param_info)
 
-            return_type = _get_type_annotation(node.returns)
+            return_type = _get_type_annotation(node.returns, annotation_cache)
 
             # Parse test cases from docstring
             test_cases = _parse_test_cases(docstring, node.name)
@@ -72,8 +123,26 @@ def extract_function_info(tree: ast.AST, source_file: str) -> Optional[FunctionS
     return None
 
 
-def _get_type_annotation(annotation: Optional[ast.AST]) -> str:
-    """Convert AST type annotation to string."""
+def _iter_candidate_functions(tree: ast.AST):
+    """Yield module-level statements and the bodies of module-level classes.
+
+    Specs live on top-level functions or methods, so there is no need to
+    visit every expression node the way ast.walk does.
+    """
+    for node in getattr(tree, 'body', ()):
+        yield node
+        if isinstance(node, ast.ClassDef):
+            yield from node.body
+
+
+def _get_type_annotation(
+    annotation: Optional[ast.AST], cache: Optional[Dict[str, str]] = None
+) -> str:
+    """Convert AST type annotation to string.
+
+    Subscript results are memoized in ``cache`` (keyed on the node's
+    structural dump) so repeated generic annotations are only rendered once.
+    """
     if annotation is None:
         return "Any"
 
@@ -81,9 +150,18 @@ def _get_type_annotation(annotation: Optional[ast.AST]) -> str:
         return annotation.id
     elif isinstance(annotation, ast.Subscript):
         # Handle Optional[T], List[T], etc.
-        value = _get_type_annotation(annotation.value)
-        slice_val = _get_type_annotation(annotation.slice)
-        return f"{value}[{slice_val}]"
+        key = None
+        if cache is not None:
+            key = ast.dump(annotation, annotate_fields=False)
+            if key in cache:
+                return cache[key]
+
+        value = _get_type_annotation(annotation.value, cache)
+        slice_val = _get_type_annotation(annotation.slice, cache)
+        result = f"{value}[{slice_val}]"
+        if key is not None:
+            cache[key] = result
+        return result
     elif isinstance(annotation, ast.Constant):
         return str(annotation.value)
     else:
@@ -111,11 +189,13 @@ def _parse_test_cases(docstring: str, function_name: str) -> List[TestCase]:
             continue
 
         # Stop at next major section
-        if stripped and not stripped.startswith(('-', ' ')) and stripped.endswith(':'):
+        if _CATEGORY_RE.fullmatch(stripped):
             # Check if it's a test category or end of test section
-            if stripped in ["Examples:", "Note:", "Returns:", "See Also:"]:
+            if _SECTION_STOP_RE.fullmatch(stripped):
                 break
-            current_category = stripped.rstrip(':')
+            # Interned so the category shared by every case in the block
+            # compares and hashes by identity downstream
+            current_category = sys.intern(stripped.rstrip(':'))
             continue
 
         # Parse individual test case
@@ -147,12 +227,9 @@ def _parse_test_case_line(
     # Parse based on category
     if category == "Error Conditions":
         # Format: "Negative price: ValueError \"Price cannot be negative\""
-        if "ValueError" in spec or "TypeError" in spec or "KeyError" in spec:
-            error_type = "ValueError"  # Default
-            for err in ["ValueError", "TypeError", "KeyError", "AttributeError"]:
-                if err in spec:
-                    error_type = err
-                    break
+        error_match = _ERROR_TYPE_RE.search(spec)
+        if error_match:
+            error_type = error_match.group(1)
 
             # Extract error message
             error_msg = ""
@@ -194,46 +271,24 @@ def _parse_test_case_line(
 
 def _infer_inputs_from_description(description: str, function_name: str) -> Dict[str, Any]:
     """Infer function inputs from test case description."""
-    inputs = {}
-
     # Common patterns for calculate_discount
-    if "negative price" in description.lower():
-        inputs["original_price"] = "-100.00"
-    elif "negative discount" in description.lower():
-        inputs["original_price"] = "100.00"
-        inputs["discount_percent"] = "-10"
-    elif "discount > 100" in description.lower() or "over 100" in description.lower():
-        inputs["original_price"] = "100.00"
-        inputs["discount_percent"] = "150"
-    elif "invalid tier" in description.lower():
-        inputs["original_price"] = "100.00"
-        inputs["discount_percent"] = "10"
-        inputs["member_tier"] = "invalid_tier"
-    elif "zero quantity" in description.lower():
-        inputs["original_price"] = "100.00"
-        inputs["discount_percent"] = "10"
-        inputs["quantity"] = "0"
-    elif "negative quantity" in description.lower():
-        inputs["original_price"] = "100.00"
-        inputs["discount_percent"] = "10"
-        inputs["quantity"] = "-1"
-
-    return inputs
+    match = _ERROR_INPUT_RE.search(description)
+    if not match:
+        return {}
+    return dict(_ERROR_INPUT_TEMPLATES[match.group(0).lower()])
 
 
 def _parse_inputs(inputs_str: str, function_name: str) -> Dict[str, Any]:
     """Parse input specification like '$100, 10%, gold, qty=5'."""
     inputs = {}
-    parts = [p.strip() for p in inputs_str.split(',')]
 
     positional_index = 0
-    for part in parts:
-        # Handle key=value format
-        if '=' in part:
-            key, value = part.split('=', 1)
-            key = key.strip()
-            value = value.strip()
+    for match in _INPUT_TOKEN_RE.finditer(inputs_str):
+        key = match.group('key')
+        value = match.group('value')
 
+        # Handle key=value format
+        if key is not None:
             # Parse value
             if value.startswith('$'):
                 value = value[1:]
@@ -245,15 +300,13 @@ def _parse_inputs(inputs_str: str, function_name: str) -> Dict[str, Any]:
             # Positional arguments - map to function parameters
             # For calculate_discount: original_price, discount_percent, member_tier, quantity
             if positional_index == 0:  # First positional: original_price
-                value = part.strip('$')
-                inputs["original_price"] = value
+                inputs["original_price"] = value.strip('$')
             elif positional_index == 1:  # Second positional: discount_percent
-                value = part.strip('%')
-                inputs["discount_percent"] = value
+                inputs["discount_percent"] = value.strip('%')
             elif positional_index == 2:  # Third positional: member_tier
-                value = part.strip("'\"")
+                value = value.strip("'\"")
                 if value and not value.isdigit():
-                    inputs["member_tier"] = value
+                    inputs["member_tier"] = sys.intern(value)
 
             positional_index += 1
 
@@ -287,25 +340,97 @@ def _parse_output(output_str: str) -> Any:
     return output
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: docstring_to_test_cases.py <function_spec.py> [output.json]")
-        sys.exit(1)
+def _cache_key(source_file: str) -> tuple:
+    """Build the cache validity key for a source file."""
+    st = os.stat(source_file)
+    return (st.st_mtime_ns, st.st_size, sys.version_info[:2], CACHE_VERSION)
 
-    source_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
 
-    # Parse source file
-    with open(source_file, 'r') as f:
-        source_code = f.read()
+def _cache_path(source_file: str) -> Path:
+    """Return the pickle cache location for a source file."""
+    digest = hashlib.sha1(os.path.abspath(source_file).encode()).hexdigest()
+    return CACHE_DIR / f"{digest}.pkl"
 
-    tree = ast.parse(source_code)
-    spec = extract_function_info(tree, source_file)
 
+def _load_cached_output(source_file: str) -> Optional[Dict[str, Any]]:
+    """Return the cached extraction output if the source is unchanged.
+
+    Any failure to read or unpickle the entry (truncated file, pickle from
+    an incompatible version, ...) is treated as a cache miss.
+    """
+    try:
+        with open(_cache_path(source_file), 'rb') as f:
+            key, output = pickle.load(f)
+    except Exception:
+        return None
+
+    if key != _cache_key(source_file):
+        return None
+    return output
+
+
+def _store_cached_output(source_file: str, output: Dict[str, Any]) -> None:
+    """Persist extraction output; caching is best-effort.
+
+    The pickle is written to a unique temp file in the cache directory and
+    renamed into place, so concurrent writers and readers never see a
+    partially written entry.
+    """
+    cache_file = _cache_path(source_file)
+    tmp_path = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'wb', dir=cache_file.parent, prefix=cache_file.name + '.',
+            suffix='.tmp', delete=False,
+        ) as f:
+            tmp_path = f.name
+            pickle.dump((_cache_key(source_file), output), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _dump_json(output: Dict[str, Any]) -> bytes:
+    """Serialize output as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(output, option=orjson.OPT_INDENT_2)
+    return json.dumps(output, indent=2).encode()
+
+
+def extract_output(source_file: str) -> Optional[Dict[str, Any]]:
+    """Extract the JSON-ready test specification for a source file.
+
+    Returns None when the file has no function with a "Test Cases:" section.
+    """
+    output = _load_cached_output(source_file)
+    if output is not None:
+        # The cache is keyed on the absolute path, but module_path should
+        # echo this call's spelling of it (./x.py, x.py, /abs/x.py)
+        output["module_path"] = source_file
+        return output
+
+    with open(source_file, 'rb') as f:
+        source_bytes = f.read()
+
+    # Skip the full parse when no docstring can contain a spec
+    if b"Test Cases:" not in source_bytes:
+        return None
+
+    # Parse source file
+    tree = ast.parse(
+        source_bytes,
+        filename=source_file,
+        type_comments=False,
+        feature_version=sys.version_info[:2],
+    )
+    spec = extract_function_info(tree, source_file)
     if not spec:
-        print("Error: No function with test cases found in source file", file=sys.stderr)
-        sys.exit(1)
+        return None
 
     # Convert to JSON
     output = {
@@ -313,17 +438,96 @@ def main():
         "module_path": spec.module_path,
         "parameters": spec.parameters,
         "return_type": spec.return_type,
-        "test_cases": [asdict(tc) for tc in spec.test_cases],
+        # The TestCase objects are discarded after this, so asdict's deep copy is unnecessary
+        "test_cases": [vars(tc) for tc in spec.test_cases],
     }
+    _store_cached_output(source_file, output)
+    return output
+
+
+def _process_spec_file(source_file: str, output_file: str) -> Optional[int]:
+    """Extract one spec file to JSON; returns the test case count or None."""
+    output = extract_output(source_file)
+    if output is None:
+        return None
+
+    with open(output_file, 'wb') as f:
+        f.write(_dump_json(output))
+    return len(output['test_cases'])
+
+
+def batch_main(spec_dir: str, output_dir: Optional[str] = None) -> Tuple[int, int]:
+    """Extract every *.py spec in a directory in parallel.
+
+    Each spec is written to ``<output_dir>/<stem>.json``. Parsing is
+    CPU-bound, so work is spread over processes rather than threads.
+    A file that fails to parse is reported and does not stop the others.
+    Returns (files that contained test cases, files that failed).
+    """
+    out_dir = Path(output_dir or spec_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    source_files = sorted(Path(spec_dir).glob('*.py'))
+
+    extracted = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {
+            pool.submit(_process_spec_file, str(src), str(out_dir / f"{src.stem}.json")): src
+            for src in source_files
+        }
+        for future in as_completed(futures):
+            src = futures[future]
+            try:
+                count = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Failed {src}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            if count is None:
+                print(f"Skipped {src}: no function with test cases", file=sys.stderr)
+            else:
+                extracted += 1
+                print(f"Extracted {count} test cases from {src}")
+
+    return extracted, failed
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print("Usage: docstring_to_test_cases.py <function_spec.py> [output.json]")
+        print("       docstring_to_test_cases.py --batch <spec_dir> [output_dir]")
+        sys.exit(1)
+
+    if sys.argv[1] == '--batch':
+        if len(sys.argv) < 3:
+            print("Usage: docstring_to_test_cases.py --batch <spec_dir> [output_dir]")
+            sys.exit(1)
+        extracted, failed = batch_main(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        if failed:
+            print(f"Error: {failed} spec file(s) failed to parse", file=sys.stderr)
+            sys.exit(1)
+        if not extracted:
+            print("Error: No function with test cases found in spec directory", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    source_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+
+    output = extract_output(source_file)
+    if output is None:
+        print("Error: No function with test cases found in source file", file=sys.stderr)
+        sys.exit(1)
 
     # Output
-    json_str = json.dumps(output, indent=2)
+    json_bytes = _dump_json(output)
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(json_str)
-        print(f"Extracted {len(spec.test_cases)} test cases to {output_file}")
+        with open(output_file, 'wb') as f:
+            f.write(json_bytes)
+        print(f"Extracted {len(output['test_cases'])} test cases to {output_file}")
     else:
-        print(json_str)
+        print(json_bytes.decode())
 
 
 if __name__ == "__main__":
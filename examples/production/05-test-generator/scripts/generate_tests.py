@@ -7,27 +7,67 @@ specifications and generates a complete pytest test file.
 """
 
 import json
+import re
 import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, TextIO
 
+# Strings that should be emitted as Decimal literals (e.g. "100", "-0.5")
+_DECIMAL_RE = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)')
 
-def generate_test_class(spec: Dict[str, Any]) -> str:
-    """Generate a complete pytest test class from specification."""
+# Test method templates, filled in with str.format
+_PARAMETRIZE_HEAD_TMPL = '''    @pytest.mark.parametrize(
+        "{params}",
+        [
+'''
+
+_PARAMETRIZE_TAIL_TMPL = '''
+        ],
+        ids=[{ids}]
+    )
+    def {method}(self, {params}):
+        """Test {category} scenarios."""
+        result = {fn}({kwargs})
+        assert result == expected, f"Expected {{expected}}, got {{result}}"
+
+'''
+
+_REGULAR_TEST_TMPL = '''    def {test_id}(self):
+        """{desc}."""
+        result = {fn}({args})
+        assert result == {expected}, f"Expected {{{expected}}}, got {{result}}"
+
+'''
+
+_ERROR_TEST_TMPL = '''    def {test_id}(self):
+        """{desc}."""
+        with pytest.raises({error_type}{match_clause}):
+            {fn}({args})
+
+'''
+
+
+def generate_test_class(spec: Dict[str, Any], out: TextIO) -> None:
+    """Write a complete pytest test class from specification to ``out``.
+
+    Output is streamed as it is produced, so large suites are never held
+    in memory as a single string.
+    """
     function_name = spec['function_name']
     class_name = f"Test{function_name[0].upper()}{function_name[1:]}"
     test_cases = spec['test_cases']
 
-    # Group test cases by category
-    categories = {}
+    # Group test cases by category. Names loaded from JSON are not interned;
+    # interning lets lookups against the category literals below match by
+    # identity instead of by string comparison.
+    categories = defaultdict(list)
     for tc in test_cases:
-        cat = tc['category']
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(tc)
+        categories[sys.intern(tc['category'])].append(tc)
 
     # Generate imports
-    imports = f'''"""
+    out.write(f'''"""
 Generated test suite for {function_name}.
 
 Auto-generated from function docstring specification.
@@ -38,46 +78,45 @@ from decimal import Decimal
 from input.function_spec import {function_name}
 
 
-'''
+''')
 
     # Generate test class
-    class_doc = f'''class {class_name}:
+    out.write(f'''class {class_name}:
     """
     Comprehensive test suite for {function_name}.
 
     Generated from docstring specifications with:
-    - {len([tc for tc in test_cases if tc['category'] == 'Happy Path'])} happy path tests
-    - {len([tc for tc in test_cases if tc['category'] == 'Edge Cases'])} edge case tests
-    - {len([tc for tc in test_cases if tc['category'] == 'Error Conditions'])} error condition tests
-    - {len([tc for tc in test_cases if tc['category'] == 'Boundary Tests'])} boundary tests
+    - {len(categories.get('Happy Path', ()))} happy path tests
+    - {len(categories.get('Edge Cases', ()))} edge case tests
+    - {len(categories.get('Error Conditions', ()))} error condition tests
+    - {len(categories.get('Boundary Tests', ()))} boundary tests
 
     Target coverage: >90%
     """
 
-'''
-
-    test_methods = []
+''')
 
-    # Generate tests for each category
-    for category, cases in categories.items():
-        test_methods.append(f"    # {category}\n")
+    # Generate tests for each category; every block after the first is
+    # preceded by a blank separator line
+    for index, (category, cases) in enumerate(categories.items()):
+        if index:
+            out.write("\n")
+        out.write(f"    # {category}\n")
 
         if category == "Error Conditions":
             # Generate error tests
             for tc in cases:
-                method = _generate_error_test(tc, function_name)
-                test_methods.append(method)
+                out.write("\n")
+                _generate_error_test(tc, function_name, out)
         else:
             # Generate regular tests - check if parametrization is beneficial
             if len(cases) >= 3 and _can_parametrize(cases):
-                method = _generate_parametrized_test(cases, function_name, category)
-                test_methods.append(method)
+                out.write("\n")
+                _generate_parametrized_test(cases, function_name, category, out)
             else:
                 for tc in cases:
-                    method = _generate_regular_test(tc, function_name)
-                    test_methods.append(method)
-
-    return imports + class_doc + "\n".join(test_methods)
+                    out.write("\n")
+                    _generate_regular_test(tc, function_name, out)
 
 
 def _can_parametrize(test_cases: List[Dict]) -> bool:
@@ -86,54 +125,51 @@ def _can_parametrize(test_cases: List[Dict]) -> bool:
     if not test_cases:
         return False
 
-    first_inputs = set(test_cases[0]['inputs'].keys())
-    return all(set(tc['inputs'].keys()) == first_inputs for tc in test_cases)
+    # dict_keys compare as sets without allocating a new set per case
+    first_inputs = test_cases[0]['inputs'].keys()
+    return all(tc['inputs'].keys() == first_inputs for tc in test_cases)
 
 
 def _generate_parametrized_test(
-    test_cases: List[Dict], function_name: str, category: str
-) -> str:
-    """Generate a parametrized test for similar test cases."""
-    # Extract parameter names
-    param_names = sorted(test_cases[0]['inputs'].keys())
-    param_names.append('expected')
+    test_cases: List[Dict], function_name: str, category: str, out: TextIO
+) -> None:
+    """Write a parametrized test for similar test cases to ``out``."""
+    # Extract parameter names in docstring order (dicts preserve insertion order)
+    input_params = list(test_cases[0]['inputs'])
+    param_names = input_params + ['expected']
 
     # Build parameter list
     param_str = ', '.join(param_names)
 
-    # Build test data
-    test_data = []
-    test_ids = []
+    method_name = f"test_{category.lower().replace(' ', '_')}_parametrized"
 
-    for tc in test_cases:
+    out.write(_PARAMETRIZE_HEAD_TMPL.format(params=param_str))
+
+    # Write test data rows
+    for index, tc in enumerate(test_cases):
+        if index:
+            out.write(",\n")
         inputs = tc['inputs']
-        values = [_format_value(inputs.get(p, 'None')) for p in param_names[:-1]]
+        values = [_format_value(inputs.get(p, 'None')) for p in input_params]
         values.append(_format_value(tc['expected_output']))
-        test_data.append(f"        ({', '.join(values)})")
-        test_ids.append(tc['description'].lower().replace(' ', '_')[:30])
-
-    test_data_str = ',\n'.join(test_data)
-    test_ids_str = ', '.join(f'"{tid}"' for tid in test_ids)
-
-    method_name = f"test_{category.lower().replace(' ', '_')}_parametrized"
+        out.write(f"        ({', '.join(values)})")
 
-    return f'''    @pytest.mark.parametrize(
-        "{param_str}",
-        [
-{test_data_str}
-        ],
-        ids=[{test_ids_str}]
+    test_ids_str = ', '.join(
+        f'"{tc["description"].lower().replace(" ", "_")[:30]}"' for tc in test_cases
     )
-    def {method_name}(self, {param_str}):
-        """Test {category.lower()} scenarios."""
-        result = {function_name}({', '.join(f'{p}={p}' for p in param_names[:-1])})
-        assert result == expected, f"Expected {{expected}}, got {{result}}"
 
-'''
+    out.write(_PARAMETRIZE_TAIL_TMPL.format(
+        ids=test_ids_str,
+        method=method_name,
+        params=param_str,
+        category=category.lower(),
+        fn=function_name,
+        kwargs=', '.join(f'{p}={p}' for p in input_params),
+    ))
 
 
-def _generate_regular_test(test_case: Dict, function_name: str) -> str:
-    """Generate a single test method."""
+def _generate_regular_test(test_case: Dict, function_name: str, out: TextIO) -> None:
+    """Write a single test method to ``out``."""
     desc = test_case['description']
     test_id = test_case['test_id']
     inputs = test_case['inputs']
@@ -143,16 +179,13 @@ def _generate_regular_test(test_case: Dict, function_name: str) -> str:
     args = ', '.join(f"{k}={_format_value(v)}" for k, v in inputs.items())
     expected_formatted = _format_value(expected)
 
-    return f'''    def {test_id}(self):
-        """{desc}."""
-        result = {function_name}({args})
-        assert result == {expected_formatted}, f"Expected {{{expected_formatted}}}, got {{result}}"
-
-'''
+    out.write(_REGULAR_TEST_TMPL.format(
+        test_id=test_id, desc=desc, fn=function_name, args=args, expected=expected_formatted
+    ))
 
 
-def _generate_error_test(test_case: Dict, function_name: str) -> str:
-    """Generate a test for error conditions."""
+def _generate_error_test(test_case: Dict, function_name: str, out: TextIO) -> None:
+    """Write a test for error conditions to ``out``."""
     desc = test_case['description']
     test_id = test_case['test_id']
     inputs = test_case['inputs']
@@ -172,30 +205,40 @@ def _generate_error_test(test_case: Dict, function_name: str) -> str:
 
     match_clause = f', match="{error_msg}"' if error_msg else ''
 
-    return f'''    def {test_id}(self):
-        """{desc}."""
-        with pytest.raises({error_type}{match_clause}):
-            {function_name}({args})
-
-'''
+    out.write(_ERROR_TEST_TMPL.format(
+        test_id=test_id,
+        desc=desc,
+        error_type=error_type,
+        match_clause=match_clause,
+        fn=function_name,
+        args=args,
+    ))
 
 
 def _format_value(value: Any) -> str:
-    """Format a value for Python code."""
-    if value is None:
-        return "None"
+    """Format a value for Python code.
 
-    if isinstance(value, bool):
-        return str(value)
+    Cached because the same literals (e.g. "100") recur across most rows.
+    The output depends only on the value's type and str(), so that pair is
+    the key: equal values that print differently (0.0 and -0.0, Decimal
+    100 and 100.00) keep separate entries, and lists and dicts need no
+    special case.
+    """
+    return _format_literal(type(value), str(value))
 
-    if isinstance(value, (int, float)):
-        return str(value)
 
-    # String value - check if it's a number that should be Decimal
-    value_str = str(value)
+@lru_cache(maxsize=1024)
+def _format_literal(value_type: type, value_str: str) -> str:
+    """Format a value, given as its type and str(), for Python code."""
+    if value_type is type(None):
+        return "None"
 
-    # Check if it looks like a price/decimal number
-    if value_str.replace('.', '').replace('-', '').isdigit():
+    # bool, int and float print as valid literals
+    if issubclass(value_type, (int, float)):
+        return value_str
+
+    # String value - check if it looks like a price/decimal number
+    if _DECIMAL_RE.fullmatch(value_str):
         return f"Decimal('{value_str}')"
 
     # Regular string
@@ -215,12 +258,9 @@ def main():
     with open(test_cases_file, 'r') as f:
         spec = json.load(f)
 
-    # Generate test code
-    test_code = generate_test_class(spec)
-
-    # Write output
+    # Generate test code straight into the output file
     with open(output_file, 'w') as f:
-        f.write(test_code)
+        generate_test_class(spec, f)
 
     print(f"Generated {len(spec['test_cases'])} tests to {output_file}")
 
@@ -3,11 +3,12 @@
 Example 1: Simple Unconstrained Generation
 
 Demonstrates basic usage of Ananke for simple code generation
-without constraints.
+without constraints, streaming the output as it is generated.
 """
 
 import asyncio
 import os
+import time
 from ananke import Ananke, PyGenerationRequest, PyGenerationContext
 
 
@@ -35,21 +36,30 @@ async def main():
     print(f"Prompt: {request.prompt}")
     print()
 
-    # Generate code
-    response = await ananke.generate(request)
-
-    # Display results
+    # Stream code as it is generated instead of waiting for the full completion
     print("=" * 80)
     print("Generated Code:")
     print("=" * 80)
-    print(response.code)
+
+    chunks = []
+    first_chunk_ms = None
+    # Measured from before the request is sent, so it includes connection
+    # setup, queueing and prefill (chunk.timestamp_ms starts at the headers)
+    start = time.perf_counter()
+    async for chunk in ananke.stream_generate(request):
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - start) * 1000
+        print(chunk.text, end="", flush=True)
+        chunks.append(chunk.text)
+
+    code = "".join(chunks)
+    print()
     print("=" * 80)
     print()
-    print(f"Tokens generated: {response.tokens_generated}")
-    print(f"Finish reason: {response.finish_reason}")
-    print(f"Model: {response.provenance.model}")
-    print(f"Constraints satisfied: {response.validation.all_satisfied}")
-
+    print(f"Chunks received: {len(chunks)}")
+    print(f"Characters generated: {len(code)}")
+    if first_chunk_ms is not None:
+        print(f"Time to first chunk: {first_chunk_ms:.0f}ms")
 
 if __name__ == "__main__":
     # Requires ANANKE_MODAL_ENDPOINT environment variable
@@ -12,13 +12,27 @@ import os
 from ananke import Ananke, PyConstraintIR
 
 
+def canonical_schema(schema: dict) -> str:
+    """Serialize a JSON schema in canonical form (sorted keys, no whitespace).
+
+    Maze already hashes parsed schemas in canonical form, so key order does
+    not affect its cache; canonicalizing up front also keeps the schema
+    string itself stable when it is used as a key by application caches.
+    """
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"))
+
+
 async def main():
-    # Initialize Ananke with caching enabled
+    # Initialize Ananke with caching enabled. The persistent directory backs
+    # the in-memory cache, so reruns of this example skip recompilation.
     ananke = Ananke(
         modal_endpoint=os.getenv("ANANKE_MODAL_ENDPOINT"),
         modal_api_key=os.getenv("ANANKE_MODAL_API_KEY"),
         enable_cache=True,
-        cache_size=100
+        cache_size=100,
+        persistent_cache_dir=os.getenv(
+            "ANANKE_CACHE_DIR", os.path.expanduser("~/.cache/ananke")
+        )
     )
 
     print("Cache Management Example")
@@ -32,7 +46,7 @@ async def main():
     # Create a constraint
     constraint = PyConstraintIR(
         name="simple_object",
-        json_schema=json.dumps({
+        json_schema=canonical_schema({
             "type": "object",
             "properties": {
                 "id": {"type": "integer"},
@@ -66,6 +80,30 @@ async def main():
     print(f"Cache size after second compilation: {stats['size']}/{stats['limit']}")
     print()
 
+    # Compile several constraint sets in one call instead of one await each
+    print("Compiling a batch of constraint sets...")
+    tagged = PyConstraintIR(
+        name="tagged_object",
+        json_schema=canonical_schema({
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "tags": {"type": "array", "items": {"type": "string"}}
+            }
+        }),
+        grammar=None,
+        regex_patterns=[]
+    )
+    batch = await ananke.compile_constraints_many([[constraint], [tagged]])
+    for result in batch:
+        print(f"Compiled hash: {result['hash'][:16]}...")
+    print(f"First hash matches earlier result: {batch[0]['hash'] == result1['hash']}")
+    print()
+
+    stats = await ananke.cache_stats()
+    print(f"Cache size after batch compilation: {stats['size']}/{stats['limit']}")
+    print()
+
     # Clear the cache
     print("Clearing cache...")
     await ananke.clear_cache()
@@ -74,6 +112,12 @@ async def main():
     print(f"Cache size after clear: {stats['size']}/{stats['limit']}")
     print()
 
+    # Clearing only empties memory; the on-disk tier still has the entry
+    print("Compiling after clear (served from the persistent cache)...")
+    result3 = await ananke.compile_constraints([constraint])
+    print(f"Compiled at same time as first run: {result3['compiled_at'] == result1['compiled_at']}")
+    print()
+
     print("=" * 80)
     print("Cache management complete!")
 
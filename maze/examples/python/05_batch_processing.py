@@ -3,15 +3,25 @@
 Example 5: Batch Processing
 
 Demonstrates how to process multiple generation requests
-efficiently using asyncio concurrency.
+efficiently using asyncio concurrency. Requests run in an
+asyncio.TaskGroup, capped at MAX_CONCURRENCY in flight, and each
+result is reported as it completes. uvloop is used when installed.
 """
 
 import asyncio
 import os
 from ananke import Ananke, PyGenerationRequest, PyGenerationContext
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the stock event loop works too
+    uvloop = None
 
-async def generate_one(ananke: Ananke, prompt: str, index: int):
+# Upper bound on requests in flight, so large batches don't flood the endpoint
+MAX_CONCURRENCY = 8
+
+
+async def generate_one(ananke: Ananke, prompt: str, index: int, limit: asyncio.Semaphore):
     """Generate code for a single prompt"""
     context = PyGenerationContext(
         current_file=f"example_{index}.py",
@@ -27,15 +37,16 @@ async def generate_one(ananke: Ananke, prompt: str, index: int):
         context=context
     )
 
-    print(f"[{index}] Generating for: {prompt[:50]}...")
-    response = await ananke.generate(request)
-    print(f"[{index}] Complete! Generated {response.tokens_generated} tokens")
+    async with limit:
+        print(f"[{index}] Generating for: {prompt[:50]}...")
+        response = await ananke.generate(request)
 
+    print(f"[{index}] Complete! Generated {response.metadata.tokens_generated} tokens")
     return {
         "index": index,
         "prompt": prompt,
         "code": response.code,
-        "tokens": response.tokens_generated,
+        "tokens": response.metadata.tokens_generated,
         "satisfied": response.validation.all_satisfied
     }
 
@@ -55,12 +66,17 @@ async def main():
 
     print("Batch Processing Example")
     print("=" * 80)
-    print(f"Processing {len(prompts)} prompts concurrently...")
+    print(f"Processing {len(prompts)} prompts, up to {MAX_CONCURRENCY} at a time...")
     print()
 
-    # Process all prompts concurrently
-    tasks = [generate_one(ananke, prompt, i) for i, prompt in enumerate(prompts)]
-    results = await asyncio.gather(*tasks)
+    # Process prompts concurrently; if one fails, the TaskGroup cancels the rest
+    limit = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(generate_one(ananke, prompt, i, limit))
+            for i, prompt in enumerate(prompts)
+        ]
+    results = [task.result() for task in tasks]
 
     # Display results
     print()
@@ -84,4 +100,4 @@ if __name__ == "__main__":
         print("Error: ANANKE_MODAL_ENDPOINT environment variable not set")
         exit(1)
 
-    asyncio.run(main())
+    (uvloop.run if uvloop is not None else asyncio.run)(main())
@@ -0,0 +1,59 @@
+"""
+Local smoke test for the Ananke Modal Inference Service
+
+Kept out of inference.py so deployed containers do not import it.
+
+Usage:
+    modal run _local_test.py
+"""
+
+import json
+
+from inference import AnankeLLM, app, health
+
+
+@app.local_entrypoint()
+def main():
+    """Test the service locally"""
+    print("Testing Ananke Inference Service...")
+
+    # Test health check
+    print("\n1. Testing health check...")
+    health_result = health.remote()
+    print(f"Health: {json.dumps(health_result, indent=2)}")
+
+    # Test simple generation
+    print("\n2. Testing simple generation...")
+    simple_request = {
+        "prompt": "Write a Python function to add two numbers:",
+        "max_tokens": 100,
+        "temperature": 0.7,
+    }
+
+    llm = AnankeLLM()
+    simple_result = llm.generate.remote(simple_request)
+    print(f"Result: {json.dumps(simple_result, indent=2)}")
+
+    # Test constrained generation with JSON schema
+    print("\n3. Testing JSON schema constraint...")
+    json_request = {
+        "prompt": "Generate a user profile:",
+        "constraints": {
+            "json_schema": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "age": {"type": "integer"},
+                    "email": {"type": "string"},
+                },
+                "required": ["name", "age"],
+            }
+        },
+        "max_tokens": 100,
+        "temperature": 0.7,
+    }
+
+    json_result = llm.generate.remote(json_request)
+    print(f"Result: {json.dumps(json_result, indent=2)}")
+
+    print("\n✓ All tests completed!")
@@ -4,20 +4,21 @@ import sys
 import subprocess
 import time
 
+import requests
+
 # Test the endpoint
 print("Testing Modal endpoint...")
-result = subprocess.run([
-    "curl", "-X", "POST",
-    "https://<YOUR_MODAL_WORKSPACE>--ananke-inference-generate-api.modal.run",
-    "-H", "Content-Type: application/json",
-    "-d", '{"prompt": "def hello():"}',
-    "--max-time", "20",
-    "-v"
-], capture_output=True, text=True)
-
-print("STDOUT:", result.stdout)
-print("STDERR:", result.stderr)
-print("Return code:", result.returncode)
+try:
+    response = requests.post(
+        "https://<YOUR_MODAL_WORKSPACE>--ananke-inference-generate-api.modal.run",
+        json={"prompt": "def hello():"},
+        timeout=20,
+    )
+    print("Status:", response.status_code)
+    print("Headers:", dict(response.headers))
+    print("Body:", response.text)
+except requests.RequestException as e:
+    print("Request failed:", e)
 
 # Now get logs
 print("\n\nFetching Modal logs...")
@@ -3,19 +3,70 @@ Python client for Ananke Modal Inference Service
 
 Provides a simple interface for making requests to the deployed Modal service.
 Handles retries, timeouts, and error handling.
+
+AnankeClient is a blocking client built on requests; AsyncAnankeClient is its
+asyncio counterpart (requires aiohttp) for issuing many requests concurrently.
 """
 
+import asyncio
+import gzip
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+from dataclasses import dataclass, fields
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed for AsyncAnankeClient
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+# Statuses retried with exponential backoff by both clients
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Request bodies at least this large (e.g. with RAG context) are gzipped.
+# Responses need nothing extra: requests and aiohttp already send
+# Accept-Encoding: gzip and decompress transparently.
+COMPRESS_MIN_BYTES = 4096
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _encode_request(request: "GenerationRequest") -> Tuple[bytes, Dict[str, str]]:
+    """Encode a generate_api body, gzipped if large, with the headers it needs"""
+    body = _dumps(request.to_dict())
+    if len(body) >= COMPRESS_MIN_BYTES:
+        return gzip.compress(body, compresslevel=5), {"Content-Encoding": "gzip"}
+    return body, {}
+
+
+def _loads(data: bytes) -> Any:
+    """Decode a response body, with orjson when available
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
-@dataclass
+@dataclass(slots=True)
 class GenerationRequest:
     """Request for constrained generation"""
     prompt: str
@@ -26,9 +77,24 @@ class GenerationRequest:
     top_k: int = 50
     stop_sequences: Optional[List[str]] = None
     context: Optional[str] = None
-
-
-@dataclass
+    system_context: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # A literal is much cheaper than asdict(), which deep-copies every field
+        return {
+            "prompt": self.prompt,
+            "constraints": self.constraints,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "top_k": self.top_k,
+            "stop_sequences": self.stop_sequences,
+            "context": self.context,
+            "system_context": self.system_context,
+        }
+
+
+@dataclass(slots=True)
 class GenerationResponse:
     """Response from constrained generation"""
     generated_text: str
@@ -41,7 +107,10 @@ class GenerationResponse:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GenerationResponse":
-        return cls(**{k: v for k, v in data.items() if k in cls.__annotations__})
+        return cls(**{k: v for k, v in data.items() if k in _RESPONSE_FIELDS})
+
+
+_RESPONSE_FIELDS = frozenset(f.name for f in fields(GenerationResponse))
 
 
 class AnankeClient:
@@ -72,6 +141,11 @@ class AnankeClient:
         api_key: Optional[str] = None,
         timeout: int = 300,
         max_retries: int = 3,
+        pool_connections: int = 64,
+        pool_maxsize: int = 256,
+        keepalive_timeout: int = 75,
+        prewarm: bool = True,
+        max_concurrency: int = 10,
     ):
         """
         Initialize Ananke client.
@@ -81,10 +155,19 @@ class AnankeClient:
             api_key: Optional API key for authentication
             timeout: Request timeout in seconds (default: 300)
             max_retries: Maximum number of retries (default: 3)
+            pool_connections: Number of per-host pools to cache (default: 64)
+            pool_maxsize: Maximum pooled connections per host (default: 256)
+            keepalive_timeout: Seconds the server is asked to keep idle
+                connections open (default: 75)
+            prewarm: Open a connection during construction so the first
+                generate does not pay the TLS handshake (default: True)
+            max_concurrency: Requests generate_batch keeps in flight; keep it
+                within the server's allow_concurrent_inputs (default: 10)
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
 
         # Configure session with retries
         self.session = requests.Session()
@@ -92,18 +175,34 @@ class AnankeClient:
         retry_strategy = Retry(
             total=max_retries,
             backoff_factor=2,  # 2s, 4s, 8s delays
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=RETRY_STATUSES,
             allowed_methods=["POST", "GET"],
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the pool for concurrent callers: requests' default of 10
+        # connections makes extra threads open (and handshake) throwaway
+        # connections instead of reusing a kept-alive one
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+            max_retries=retry_strategy,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+        # Warm-up goes through a retry-free adapter sharing the same pools,
+        # so the connection it opens is reused by generate() and a down or
+        # cold service costs one short connect attempt, not a backoff cycle
+        self._warmup_adapter = HTTPAdapter(max_retries=Retry(0, read=False))
+        self._warmup_adapter.poolmanager = adapter.poolmanager
+
         # Set headers
         self.session.headers.update({
             "Content-Type": "application/json",
             "User-Agent": "ananke-client/1.0.0",
+            "Connection": "keep-alive",
+            "Keep-Alive": f"timeout={keepalive_timeout}",
         })
 
         if api_key:
@@ -111,6 +210,32 @@ class AnankeClient:
                 "Authorization": f"Bearer {api_key}",
             })
 
+        if prewarm:
+            self.warmup()
+
+    def warmup(self) -> None:
+        """
+        Establish a pooled keep-alive connection to the service.
+
+        Sends a cheap HEAD request and ignores the outcome; only the TLS
+        connection it leaves in the pool matters. Modal's load balancer may
+        drop sockets idle for ~90s, so long-idle clients should call this
+        again before a latency-sensitive request.
+        """
+        request = self.session.prepare_request(
+            requests.Request("HEAD", f"{self.base_url}/health")
+        )
+        try:
+            # Same proxy/TLS settings as session requests, so the same pool
+            settings = self.session.merge_environment_settings(
+                request.url, {}, None, None, None
+            )
+            settings.pop("stream", None)
+            response = self._warmup_adapter.send(request, timeout=(2, 5), **settings)
+            response.content  # Release the connection back to the pool
+        except requests.exceptions.RequestException:
+            pass
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check service health.
@@ -138,6 +263,7 @@ class AnankeClient:
         top_k: int = 50,
         stop_sequences: Optional[List[str]] = None,
         context: Optional[str] = None,
+        system_context: Optional[str] = None,
     ) -> GenerationResponse:
         """
         Generate code with constraints.
@@ -151,6 +277,9 @@ class AnankeClient:
             top_k: Top-k sampling parameter (default: 50)
             stop_sequences: Optional stop sequences
             context: Optional context to prepend to prompt
+            system_context: Optional system prompt placed before context.
+                Keep it identical across requests so the server can reuse
+                its prefix cache.
 
         Returns:
             GenerationResponse with generated text and metadata
@@ -168,14 +297,17 @@ class AnankeClient:
             top_k=top_k,
             stop_sequences=stop_sequences,
             context=context,
+            system_context=system_context,
         )
 
         start_time = time.time()
+        body, headers = _encode_request(request)
 
         try:
             response = self.session.post(
                 f"{self.base_url}/generate_api",
-                json=asdict(request),
+                data=body,
+                headers=headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
@@ -196,7 +328,7 @@ class AnankeClient:
         total_time = int((time.time() - start_time) * 1000)
 
         try:
-            result_data = response.json()
+            result_data = _loads(response.content)
             result = GenerationResponse.from_dict(result_data)
 
         except (json.JSONDecodeError, KeyError, TypeError) as e:
@@ -207,6 +339,78 @@ class AnankeClient:
 
         return result
 
+    def generate_stream(
+        self,
+        prompt: str,
+        constraints: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+        top_k: int = 50,
+        stop_sequences: Optional[List[str]] = None,
+        context: Optional[str] = None,
+        system_context: Optional[str] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[str]:
+        """
+        Stream generated text as the server produces it.
+
+        Takes the same arguments as generate, plus:
+            stop_event: Optional event; once set, the stream is closed after
+                the current chunk, which also cancels generation on the
+                server and frees its GPU slot. Breaking out of the loop
+                has the same effect.
+
+        Yields:
+            Text deltas, in order
+
+        Raises:
+            TimeoutError: If the request times out
+            RuntimeError: If generation fails
+        """
+        request = GenerationRequest(
+            prompt=prompt,
+            constraints=constraints,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k,
+            stop_sequences=stop_sequences,
+            context=context,
+            system_context=system_context,
+        )
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/generate_stream_api",
+                data=_dumps(request.to_dict()),
+                headers={"Accept": "text/event-stream"},
+                timeout=self.timeout,
+                stream=True,
+            )
+            response.raise_for_status()
+        except requests.exceptions.Timeout:
+            raise TimeoutError(f"Streaming request timed out after {self.timeout}s")
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Streaming request failed: {e}") from e
+
+        with response:
+            for line in response.iter_lines():
+                if stop_event is not None and stop_event.is_set():
+                    return
+                if not line.startswith(b"data: "):
+                    continue
+                data = line[len(b"data: "):]
+                if data == b"[DONE]":
+                    return
+                frame = _loads(data)
+                if "error" in frame:
+                    raise RuntimeError(f"Generation failed: {frame['error']}")
+                if frame.get("token"):
+                    yield frame["token"]
+                if frame.get("done"):
+                    return
+
     def generate_batch(
         self,
         prompts: List[str],
@@ -224,34 +428,27 @@ class AnankeClient:
         Returns:
             List of GenerationResponse objects
         """
-        # Note: Modal handles concurrent requests automatically
-        # This is a simple sequential implementation
-        # For true parallelism, use asyncio or threading
-        results = []
-
-        for prompt in prompts:
+        # requests releases the GIL while waiting on the socket, so a thread
+        # per in-flight request overlaps the round trips; the session's pool
+        # is sized well above max_concurrency so threads never wait on it
+        def generate_one(prompt: str) -> GenerationResponse:
             try:
-                result = self.generate(
+                return self.generate(
                     prompt=prompt,
                     constraints=constraints,
                     **kwargs,
                 )
-                results.append(result)
-
             except Exception as e:
                 print(f"Error generating prompt '{prompt[:50]}...': {e}")
-                # Add empty result to maintain order
-                results.append(GenerationResponse(
-                    generated_text="",
-                    tokens_generated=0,
-                    generation_time_ms=0,
-                    constraint_satisfied=False,
-                    model_name="unknown",
-                    finish_reason="error",
-                    metadata={"error": str(e)},
-                ))
+                # Empty result keeps results aligned with prompts
+                return _error_response(e)
 
-        return results
+        if not prompts:
+            return []
+
+        workers = min(len(prompts), self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(generate_one, prompts))
 
     def close(self):
         """Close the session"""
@@ -266,6 +463,267 @@ class AnankeClient:
         self.close()
 
 
+class AsyncAnankeClient:
+    """
+    Asyncio client for Ananke Modal Inference Service.
+
+    Mirrors AnankeClient, but requests are coroutines sharing one aiohttp
+    session, so a batch is sent concurrently instead of one after another.
+    Modal serves several inputs per container, so a batch of N prompts
+    takes roughly the time of the slowest one rather than the sum.
+
+    Example:
+        async with AsyncAnankeClient("https://your-app.modal.run") as client:
+            responses = await client.generate_batch([
+                "Implement secure API handler",
+                "Implement rate limiter",
+            ])
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: int = 300,
+        max_retries: int = 3,
+        max_connections: int = 256,
+        max_connections_per_host: int = 64,
+        keepalive_timeout: float = 75,
+        prewarm_connections: int = 10,
+    ):
+        """
+        Initialize async Ananke client.
+
+        Args:
+            base_url: Modal service URL (e.g., https://your-app.modal.run)
+            api_key: Optional API key for authentication
+            timeout: Request timeout in seconds (default: 300)
+            max_retries: Maximum number of retries (default: 3)
+            max_connections: Total connection limit (default: 256)
+            max_connections_per_host: Per-host connection limit; this caps
+                in-flight requests to the service (default: 64)
+            keepalive_timeout: Seconds idle connections are kept (default: 75)
+            prewarm_connections: Connections opened on `async with` entry,
+                normally the expected concurrency; 0 disables (default: 10)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncAnankeClient requires aiohttp: pip install aiohttp")
+
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.prewarm_connections = prewarm_connections
+
+        self._headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "ananke-client/1.0.0",
+        }
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+
+        # Created on first use, since aiohttp sessions bind to the running loop
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the shared session, creating it inside the running loop"""
+        if self._session is None or self._session.closed:
+            # Large pool with long-lived keep-alive sockets, so concurrent
+            # batches reuse established TLS connections instead of queueing
+            # on the pool or handshaking again
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def warmup(self, connections: int = 1) -> None:
+        """
+        Establish `connections` pooled keep-alive connections to the service.
+
+        Sends that many HEAD requests in parallel and ignores their outcome,
+        so a following batch finds TLS connections ready instead of
+        handshaking. Call again after long idle periods, since Modal's load
+        balancer may drop sockets idle for ~90s.
+        """
+        session = self._get_session()
+
+        async def head() -> None:
+            try:
+                async with session.head(
+                    f"{self.base_url}/health",
+                    timeout=aiohttp.ClientTimeout(total=5),
+                ):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*(head() for _ in range(connections)))
+
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Check service health.
+
+        Returns:
+            Health status dictionary
+
+        Raises:
+            aiohttp.ClientError: If health check fails
+        """
+        async with self._get_session().get(
+            f"{self.base_url}/health",
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def generate(
+        self,
+        prompt: str,
+        constraints: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+        top_k: int = 50,
+        stop_sequences: Optional[List[str]] = None,
+        context: Optional[str] = None,
+        system_context: Optional[str] = None,
+    ) -> GenerationResponse:
+        """
+        Generate code with constraints.
+
+        Takes the same arguments as AnankeClient.generate.
+
+        Returns:
+            GenerationResponse with generated text and metadata
+
+        Raises:
+            TimeoutError: If the request times out
+            RuntimeError: If generation fails
+            ValueError: If response is invalid
+        """
+        request = GenerationRequest(
+            prompt=prompt,
+            constraints=constraints,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k,
+            stop_sequences=stop_sequences,
+            context=context,
+            system_context=system_context,
+        )
+        payload, headers = _encode_request(request)
+        session = self._get_session()
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with session.post(
+                    f"{self.base_url}/generate_api", data=payload, headers=headers
+                ) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        # Same 2s, 4s, 8s schedule as AnankeClient's Retry
+                        await asyncio.sleep(2 * 2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    body = await response.read()
+                    break
+
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Generation timed out after {self.timeout}s. "
+                "Try reducing max_tokens or increasing timeout."
+            )
+
+        except aiohttp.ClientError as e:
+            raise RuntimeError(
+                f"Generation request failed: {e}\n"
+                f"URL: {self.base_url}\n"
+                f"Status: {getattr(e, 'status', 'N/A')}"
+            ) from e
+
+        try:
+            return GenerationResponse.from_dict(_loads(body))
+
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ValueError(
+                f"Invalid response format: {e}\n"
+                f"Response: {body[:500].decode(errors='replace')}"
+            ) from e
+
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        constraints: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> List[GenerationResponse]:
+        """
+        Generate multiple prompts concurrently.
+
+        Args:
+            prompts: List of prompts to generate
+            constraints: Shared constraints for all prompts
+            **kwargs: Additional generation parameters
+
+        Returns:
+            List of GenerationResponse objects, in prompt order. Failed
+            prompts get an empty response with finish_reason="error".
+        """
+        outcomes = await asyncio.gather(
+            *(
+                self.generate(prompt=prompt, constraints=constraints, **kwargs)
+                for prompt in prompts
+            ),
+            return_exceptions=True,
+        )
+
+        results = []
+        for prompt, outcome in zip(prompts, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"Error generating prompt '{prompt[:50]}...': {outcome}")
+                outcome = _error_response(outcome)
+            results.append(outcome)
+        return results
+
+    async def aclose(self):
+        """Close the session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        if self.prewarm_connections > 0:
+            await self.warmup(self.prewarm_connections)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
+
+
+def _error_response(error: Exception) -> GenerationResponse:
+    """Placeholder response for a failed batch entry, keeping result order"""
+    return GenerationResponse(
+        generated_text="",
+        tokens_generated=0,
+        generation_time_ms=0,
+        constraint_satisfied=False,
+        model_name="unknown",
+        finish_reason="error",
+        metadata={"error": str(error)},
+    )
+
+
 # Example usage and testing
 def main():
     """Example client usage"""
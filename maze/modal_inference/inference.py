@@ -5,9 +5,10 @@ GPU-based constrained code generation using vLLM 0.11.0 with llguidance.
 Provides HTTP API for token-level constraint enforcement during inference.
 
 Architecture:
-- Qwen2.5-Coder-32B-Instruct for code generation
+- Qwen2.5-Coder-32B-Instruct for code generation (AWQ INT4 on A100, FP8 on H100)
 - vLLM 0.11.0 with V1 structured outputs API
-- llguidance 0.7.11-0.8.0 for grammar-constrained generation (requires Rust compiler)
+- xgrammar structured outputs by default; llguidance 0.7.11-0.8.0 with
+  ANANKE_STRUCTURED_BACKEND=guidance (requires Rust compiler)
 - transformers 4.55.2, fastapi 0.115.12 (pinned for reproducibility)
 - Modal for serverless scale-to-zero deployment
 - A100-80GB GPU with 120s idle timeout
@@ -17,19 +18,61 @@ Architecture:
 Based on proven working configuration from /Users/rand/src/maze/deployment/modal/modal_app.py
 """
 
-import json
+import asyncio
+import functools
+import gzip
+import hashlib
+import itertools
+import secrets
+import threading
 import time
 import os
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
 import modal
 
+# libuv-backed event loop for the container's asyncio work (engine output
+# streams, endpoint handlers); both images install uvloop, local runs may not
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 # Modal app definition
 app = modal.App("ananke-inference")
 
 # GPU configuration (use string format per Modal 1.0 API)
-GPU_CONFIG = "A100-80GB"  # 80GB for 32B model, use "A100-40GB" for smaller models
+# A100-40GB fits the 32B model only with INT4 (awq) weights
+GPU_CONFIG = os.getenv("ANANKE_GPU", "A100-80GB")
+
+# Decoding is memory-bandwidth bound, so quantized weights raise tok/s almost
+# proportionally and free memory for KV cache. Each mode maps to a checkpoint
+# and the engine arguments that load it:
+#   awq - INT4 checkpoint; Marlin kernels fuse dequantization into the GEMM
+#   fp8 - bf16 checkpoint quantized to FP8 at load time, no offline step.
+#         H100 runs FP8 matmuls natively; A100 keeps activations in bf16
+#         and uses weight-only FP8 Marlin kernels (half the weight bytes)
+#   none - bf16 checkpoint as-is (80GB GPUs only)
+QUANTIZATION_PRESETS: Dict[str, Any] = {
+    "none": ("Qwen/Qwen2.5-Coder-32B-Instruct", {}),
+    "awq": ("Qwen/Qwen2.5-Coder-32B-Instruct-AWQ", {"quantization": "awq_marlin"}),
+    "fp8": ("Qwen/Qwen2.5-Coder-32B-Instruct", {"quantization": "fp8"}),
+}
+QUANT_MODE = os.getenv(
+    "ANANKE_QUANT", "fp8" if GPU_CONFIG.startswith("H100") else "awq"
+).lower()
+if QUANT_MODE not in QUANTIZATION_PRESETS:
+    raise ValueError(f"ANANKE_QUANT must be one of {sorted(QUANTIZATION_PRESETS)}, got {QUANT_MODE!r}")
+if GPU_CONFIG == "A100-40GB" and QUANT_MODE != "awq":
+    raise ValueError("A100-40GB only fits the 32B model with ANANKE_QUANT=awq")
+MODEL_NAME, QUANTIZATION_ARGS = QUANTIZATION_PRESETS[QUANT_MODE]
+if GPU_CONFIG.startswith("H100") and QUANT_MODE != "none":
+    # Hopper also reads the KV cache in FP8, halving attention bandwidth
+    QUANTIZATION_ARGS = {**QUANTIZATION_ARGS, "kv_cache_dtype": "fp8"}
 
 # Environment-based configuration for cost control (from maze pattern)
 MODAL_MODE = os.getenv("MODAL_MODE", "dev").lower()
@@ -47,11 +90,45 @@ else:
 
 print(f"Scaledown: {SCALEDOWN_WINDOW}s")
 
+# Structured-output backend for the engine. xgrammar applies token masks as
+# packed bitmasks and costs far less per decode step than guidance on the
+# dominant JSON-schema path, but only understands GBNF grammars (::= rules).
+# vLLM V1 fixes one backend per engine, so deployments that send Lark
+# grammars should deploy with ANANKE_STRUCTURED_BACKEND=guidance (baked into
+# the image env below so the container sees the deploy-time choice).
+STRUCTURED_OUTPUTS_BACKEND = os.getenv("ANANKE_STRUCTURED_BACKEND", "xgrammar")
+
+# Context window the engine is started with (prompt + generated tokens);
+# quantized weights leave room for a longer KV cache than bf16 did. KV blocks
+# are allocated as sequences grow, so this caps request size rather than
+# reserving memory; it also sizes the endpoints' pre-filter limits, hence
+# both images get it in their env.
+MAX_MODEL_LEN = int(os.getenv("ANANKE_MAX_LEN", "16384"))
+
 # Pinned versions for reproducibility (matches working maze example)
 VLLM_VERSION = "0.11.0"
 TRANSFORMERS_VERSION = "4.55.2"
 FASTAPI_VERSION = "0.115.12"
 
+# Weights are baked into the image at build time. Modal caches image layers
+# on its GPU nodes, so a cold start reads the checkpoint from local disk
+# instead of fetching ~60GB from HuggingFace or a network volume.
+MODEL_DIR = "/models"
+MODEL_PATH = f"{MODEL_DIR}/{MODEL_NAME}"
+
+
+def download_model():
+    """Image build step: fetch the selected checkpoint into MODEL_PATH"""
+    from huggingface_hub import snapshot_download
+
+    snapshot_download(
+        MODEL_NAME,
+        local_dir=MODEL_PATH,
+        ignore_patterns=["*.pt", "*.bin", "*.pth"],  # safetensors only
+        max_workers=16,
+    )
+
+
 # vLLM image with llguidance support - using NVIDIA CUDA base for production
 # Based on working maze example at /Users/rand/src/maze/deployment/modal/modal_app.py
 vllm_image = (
@@ -83,6 +160,8 @@ vllm_image = (
         "huggingface-hub>=0.20.0",
         "hf-transfer",
         "flashinfer-python",
+        "orjson",  # Fast JSON encoding of HTTP responses
+        "uvloop",
     )
     # Install compatible llguidance version via uv
     # vLLM 0.11.0 requires llguidance<0.8.0,>=0.7.11
@@ -100,13 +179,205 @@ vllm_image = (
         # Performance
         "HF_HUB_ENABLE_HF_TRANSFER": "1",
         "PYTORCH_CUDA_ALLOC_CONF": "expandable_segments:True",
-        "TOKENIZERS_PARALLELISM": "false",
+        # Let the Rust tokenizer use its thread pool on long prompts
+        "TOKENIZERS_PARALLELISM": "true",
+        # Deploy-time choices, so the container resolves the same config
+        "ANANKE_STRUCTURED_BACKEND": STRUCTURED_OUTPUTS_BACKEND,
+        "ANANKE_GPU": GPU_CONFIG,
+        "ANANKE_QUANT": QUANT_MODE,
+        "ANANKE_MAX_LEN": str(MAX_MODEL_LEN),
+        # xgrammar's compiled-grammar cache (keyed by the schema/grammar
+        # string); room for many distinct agent schemas per container
+        "VLLM_XGRAMMAR_CACHE_MB": "1024",
+        # Compiled kernels live on the ananke-torch-cache volume so new
+        # containers reuse them: vLLM's torch.compile cache (VLLM_CACHE_ROOT),
+        # plus Inductor/Triton and FlashInfer JIT output compiled outside it
+        "VLLM_CACHE_ROOT": "/root/.cache/vllm",
+        "TORCHINDUCTOR_CACHE_DIR": "/root/.cache/vllm/inductor",
+        "TRITON_CACHE_DIR": "/root/.cache/vllm/triton",
+        "FLASHINFER_WORKSPACE_BASE": "/root/.cache/vllm",
         # Cache
         "HF_HOME": "/cache/huggingface",
         "TRANSFORMERS_CACHE": "/cache/transformers",
     })
+    # Runs after .env so the step resolves the same ANANKE_QUANT checkpoint
+    .run_function(download_model, timeout=3600)
+)
+
+
+# Lightweight image for the HTTP endpoints. They only validate requests and
+# relay them to AnankeLLM, so they need not pull the CUDA/vLLM image on a
+# cold start. llguidance is here for the schema check in _prefilter_error.
+cpu_image = (
+    modal.Image.debian_slim(python_version="3.12")
+    .uv_pip_install(
+        f"fastapi[standard]=={FASTAPI_VERSION}",
+        "orjson",
+        "uvloop",
+        "llguidance>=0.7.11,<0.8.0",
+    )
+    .env({"ANANKE_MAX_LEN": str(MAX_MODEL_LEN)})
+)
+
+# FastAPI types for endpoint signatures; only importable inside the image, so
+# signatures name them as strings that FastAPI resolves in the container
+with cpu_image.imports():
+    from fastapi import Request
+
+
+# Request IDs are a per-container random prefix plus a counter: no entropy
+# read or UUID object per request, and next() on a count is atomic
+_REQUEST_ID_PREFIX = secrets.token_hex(3)
+_request_counter = itertools.count()
+
+
+def _next_request_id() -> str:
+    return f"{_REQUEST_ID_PREFIX}-{next(_request_counter):06x}"
+
+
+# Maximum number of deterministic (temperature=0) responses kept per container
+RESPONSE_CACHE_SIZE = 1024
+
+
+def _response_cache_key(full_prompt: str, request: "GenerationRequest") -> str:
+    """Hash everything that determines a deterministic generation's output"""
+    key_data = {
+        "prompt": full_prompt,
+        "constraints": request.constraints,
+        "max_tokens": request.max_tokens,
+        "top_p": request.top_p,
+        "top_k": request.top_k,
+        "stop": request.stop_sequences,
+    }
+    import orjson
+
+    return hashlib.sha256(orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+# Prompt-lookup (ngram) speculative decoding: proposals are copied from
+# earlier tokens of the same sequence on the CPU and verified in one forward
+# pass. Code and JSON repeat identifiers and structure, so many proposals are
+# accepted; structured-output masks are applied to the verified tokens.
+SPECULATIVE_CONFIG: Dict[str, Any] = {
+    "method": "ngram",
+    "num_speculative_tokens": 5,
+    "prompt_lookup_max": 4,
+}
+
+# Upper bound on the engine's running batch
+MAX_NUM_SEQS = 256
+
+# CUDA graph batch sizes, in tokens per decode step. With speculation each
+# sequence feeds its last token plus up to num_speculative_tokens proposals,
+# so a full batch steps with MAX_NUM_SEQS * (1 + k) tokens; larger steps
+# would fall back to eager execution. Steps are padded up to the next size.
+_CUDAGRAPH_MAX_TOKENS = MAX_NUM_SEQS * (1 + SPECULATIVE_CONFIG["num_speculative_tokens"])
+CUDAGRAPH_CAPTURE_SIZES = (
+    [1, 2, 4]
+    + list(range(8, 257, 8))
+    + list(range(288, _CUDAGRAPH_MAX_TOKENS + 1, 32))
 )
 
+# Pre-filter limits for generate_api; requests outside them never reach the GPU.
+# The model context cannot hold more than ~8 characters of prompt per token.
+MAX_PROMPT_CHARS = MAX_MODEL_LEN * 8
+MAX_TOKENS_LIMIT = min(4096, MAX_MODEL_LEN // 2)
+# Retries within this window get the earlier response: greedy
+# (temperature=0) requests with an identical payload, or any request
+# repeating a client-supplied Idempotency-Key header
+DEDUP_TTL_S = 5.0
+# Responses at least this large are gzipped for clients that accept it
+COMPRESS_MIN_BYTES = 1024
+
+
+def _prefilter_error(request: Dict[str, Any]) -> Optional[str]:
+    """Return why a request should be rejected without running the model, or None"""
+    prompt = request.get("prompt")
+    if not isinstance(prompt, str) or not prompt.strip():
+        return "prompt must be a non-empty string"
+
+    prompt_chars = sum(
+        len(request.get(field) or "") for field in ("system_context", "context", "prompt")
+    )
+    if prompt_chars > MAX_PROMPT_CHARS:
+        return f"prompt too long: {prompt_chars} characters (limit {MAX_PROMPT_CHARS})"
+
+    max_tokens = request.get("max_tokens", 2048)
+    if not isinstance(max_tokens, int) or not 0 < max_tokens <= MAX_TOKENS_LIMIT:
+        return f"max_tokens must be between 1 and {MAX_TOKENS_LIMIT}"
+
+    constraints = request.get("constraints")
+    if constraints is None:
+        return None
+    if not isinstance(constraints, dict):
+        return "constraints must be an object"
+    unknown = set(constraints) - set(ConstraintSpec.__annotations__)
+    if unknown:
+        return f"unknown constraint fields: {sorted(unknown)}"
+
+    schema = constraints.get("json_schema")
+    if schema is not None:
+        if not isinstance(schema, dict):
+            return "constraints.json_schema must be an object"
+        # Compile here so schema errors surface without occupying the GPU
+        import orjson
+
+        error = _json_schema_error(orjson.dumps(schema).decode())
+        if error:
+            return f"invalid json_schema: {error}"
+    if constraints.get("grammar") is not None and not isinstance(constraints["grammar"], str):
+        return "constraints.grammar must be a string"
+    patterns = constraints.get("regex_patterns")
+    if patterns is not None and not (
+        isinstance(patterns, list) and all(isinstance(p, str) for p in patterns)
+    ):
+        return "constraints.regex_patterns must be a list of strings"
+    return None
+
+
+# Maximum number of distinct prompt prefixes (system_context + context) whose
+# token IDs are kept per container
+PREFIX_TOKEN_CACHE_SIZE = 1024
+
+# Maximum number of distinct structured-output constraints kept per container
+GRAMMAR_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=GRAMMAR_CACHE_SIZE)
+def _structured_outputs_params(constraint_type: str, payload: str):
+    """Build StructuredOutputsParams once per distinct constraint.
+
+    Agentic workloads send the same schema or grammar thousands of times;
+    interning the params object (with the JSON schema already serialized)
+    skips rebuilding and re-serializing it per request. The payload is the
+    key itself, so it must be a string: the serialized schema, the grammar,
+    or the regex. The compiled grammar is cached separately by the backend
+    (xgrammar's GrammarCompiler) under the same string, so identical
+    constraints also skip recompilation. That compilation runs in the
+    engine core's own grammar-compile threads, never on this event loop.
+    """
+    from vllm.sampling_params import StructuredOutputsParams
+
+    if constraint_type == "json":
+        return StructuredOutputsParams(json=payload)
+    if constraint_type == "grammar":
+        return StructuredOutputsParams(grammar=payload)
+    if constraint_type == "regex":
+        return StructuredOutputsParams(regex=payload)
+    raise ValueError(f"Unsupported constraint type: {constraint_type}")
+
+
+@functools.lru_cache(maxsize=GRAMMAR_CACHE_SIZE)
+def _json_schema_error(schema: str) -> str:
+    """Compile a serialized JSON schema once; '' if valid, else the error.
+
+    Keyed on the schema string, so the endpoints compile each distinct
+    schema a client sends only once per container.
+    """
+    from llguidance import LLMatcher
+
+    return LLMatcher.validate_grammar(LLMatcher.grammar_from_json_schema(schema))
+
 
 @dataclass
 class ConstraintSpec:
@@ -129,7 +400,7 @@ class ConstraintSpec:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationRequest:
     """Request for constrained generation"""
     prompt: str
@@ -139,14 +410,30 @@ class GenerationRequest:
     top_p: float = 0.95
     top_k: int = 50
     stop_sequences: Optional[List[str]] = None
+    # Prompt layout is system_context, context, prompt. Put the parts that
+    # repeat across requests (system prompt, retrieved memory) in the first
+    # two so vLLM's prefix cache can reuse their KV blocks.
     context: Optional[str] = None
+    system_context: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GenerationRequest":
-        return cls(**{k: v for k, v in data.items() if k in cls.__annotations__})
+        return cls(**{k: v for k, v in data.items() if k in _REQUEST_FIELDS})
 
+    def prompt_prefix(self) -> str:
+        """The stable parts (system_context, context) with their separator, or ''"""
+        prefix = "\n\n".join(part for part in (self.system_context, self.context) if part)
+        return prefix + "\n\n" if prefix else ""
 
-@dataclass
+    def full_prompt(self) -> str:
+        """Join the prompt parts, stable prefix parts first"""
+        return self.prompt_prefix() + self.prompt
+
+
+_REQUEST_FIELDS = frozenset(f.name for f in fields(GenerationRequest))
+
+
+@dataclass(slots=True)
 class GenerationResponse:
     """Response from constrained generation"""
     generated_text: str
@@ -157,15 +444,42 @@ class GenerationResponse:
     finish_reason: str
     metadata: Optional[Dict[str, Any]] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        # A literal is much cheaper than asdict(), which deep-copies every field
+        return {
+            "generated_text": self.generated_text,
+            "tokens_generated": self.tokens_generated,
+            "generation_time_ms": self.generation_time_ms,
+            "constraint_satisfied": self.constraint_satisfied,
+            "model_name": self.model_name,
+            "finish_reason": self.finish_reason,
+            "metadata": self.metadata,
+        }
+
+
+# Fields shared by every error response; copied shallowly per failure
+_ERROR_TEMPLATE: Dict[str, Any] = {
+    "generated_text": "",
+    "tokens_generated": 0,
+    "generation_time_ms": 0,
+    "constraint_satisfied": False,
+    "model_name": None,
+    "finish_reason": "error",
+    "metadata": None,
+}
+
 
 @app.cls(
     image=vllm_image,
     gpu=GPU_CONFIG,
-    timeout=3600,  # 1 hour timeout (needed for first-time model download ~15min + generation)
+    timeout=3600,  # 1 hour timeout for long generations
     scaledown_window=SCALEDOWN_WINDOW,  # Environment-based cost control (dev/demo/prod)
-    allow_concurrent_inputs=10,  # Handle multiple requests per container
+    # Inputs only wait on the async engine, which batches them continuously;
+    # admit enough to fill max_num_seqs
+    allow_concurrent_inputs=MAX_NUM_SEQS,
     volumes={
-        # Cache HuggingFace model weights for faster cold starts (matches working maze example)
+        # HuggingFace cache for anything fetched at runtime; the model
+        # weights themselves are in the image (see download_model)
         "/cache": modal.Volume.from_name(
             "ananke-model-cache", create_if_missing=True
         ),
@@ -180,16 +494,17 @@ class AnankeLLM:
     Ananke LLM inference service with constrained generation.
 
     Uses vLLM for fast GPU inference and llguidance for constraint enforcement.
-    Scales to zero when idle. First cold start: 10-15min (model download), subsequent: ~3-5s (cached).
+    Scales to zero when idle. Weights are baked into the image, so cold starts load them from local disk.
     """
 
-    model_name: str = "Qwen/Qwen2.5-Coder-32B-Instruct"  # Better code model than Llama
+    model_name: str = MODEL_NAME  # Better code model than Llama
 
     @modal.enter()
-    def initialize_model(self):
+    async def initialize_model(self):
         """Initialize vLLM engine with llguidance support on container start"""
         import logging
-        from vllm import LLM, SamplingParams
+        from vllm import AsyncEngineArgs, AsyncLLMEngine, SamplingParams
+        from vllm.config import CompilationConfig, StructuredOutputsConfig
 
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.INFO)
@@ -216,27 +531,86 @@ class AnankeLLM:
             if vllm_version != "0.11.0":
                 logger.warning(f"vLLM {vllm_version} may have compatibility issues, 0.11.0 recommended")
 
-            # Initialize vLLM with V1 structured outputs API
-            self.llm = LLM(
-                model=self.model_name,
+            # Initialize the async vLLM engine with V1 structured outputs API.
+            # Concurrent inputs are continuously batched by the engine, and
+            # generation no longer blocks the container's event loop.
+            self.engine = AsyncLLMEngine.from_engine_args(AsyncEngineArgs(
+                model=MODEL_PATH,
+                served_model_name=self.model_name,
                 tensor_parallel_size=1,
-                gpu_memory_utilization=0.90,
-                max_model_len=8192,
-                dtype="bfloat16",
-                trust_remote_code=True,
-                download_dir="/cache/models",  # Use persistent volume for model cache
-                # V1 structured outputs backend - use guidance for llguidance support
-                structured_outputs_config={"backend": "guidance"},
+                # Everything past weights, activations and CUDA graph memory
+                # becomes KV cache. The 40GB card keeps a larger relative
+                # margin for the compile/graph workspace.
+                gpu_memory_utilization=0.92 if GPU_CONFIG == "A100-40GB" else 0.95,
+                max_model_len=MAX_MODEL_LEN,
+                # Upper bound on the running batch. The engine sizes the KV
+                # cache from gpu_memory_utilization and the scheduler only
+                # admits sequences whose blocks fit, so smaller cards simply
+                # run fewer of these at once
+                max_num_seqs=MAX_NUM_SEQS,
+                block_size=32,  # Fewer, larger KV blocks for long batched decodes
+                dtype="auto",  # Quantized checkpoints pick their own activation dtype
+                **QUANTIZATION_ARGS,
+                trust_remote_code=False,  # Qwen2 is native to transformers
+                # V1 structured outputs backend (xgrammar unless overridden)
+                structured_outputs_config=StructuredOutputsConfig(
+                    backend=STRUCTURED_OUTPUTS_BACKEND
+                ),
+                # Reuse KV blocks for shared prompt prefixes (system_context/context)
+                enable_prefix_caching=True,
+                # Split long prefills into chunks so running decodes keep
+                # getting scheduled instead of stalling behind a big prompt
+                enable_chunked_prefill=True,
+                max_num_batched_tokens=16384,
+                speculative_config=SPECULATIVE_CONFIG,
+                # async_scheduling (preparing step N+1, grammar bitmasks
+                # included, while step N runs) is left off: vLLM 0.11 rejects
+                # it together with speculative decoding
+                # Piecewise torch.compile plus CUDA graphs for the decode step,
+                # amortizing kernel launches; sizes cover a full batch of
+                # speculative steps (see CUDAGRAPH_CAPTURE_SIZES)
+                enforce_eager=False,
+                compilation_config=CompilationConfig(
+                    level=3,
+                    cudagraph_capture_sizes=CUDAGRAPH_CAPTURE_SIZES,
+                ),
+            ))
+
+            self.tokenizer = await self.engine.get_tokenizer()
+            # Agent loops resend the same system_context/context every turn;
+            # tokenize each distinct prefix once
+            self._encode_prefix = functools.lru_cache(maxsize=PREFIX_TOKEN_CACHE_SIZE)(
+                lambda prefix: tuple(self.tokenizer.encode(prefix))
             )
 
-            self.tokenizer = self.llm.get_tokenizer()
+            # CUDA graphs are captured for every size during engine start;
+            # a batch of short generations also runs the remaining lazy paths
+            # (batched sampling, speculative verification) before the first
+            # user request instead of during it
+            async def warmup(i: int):
+                async for _ in self.engine.generate(
+                    "def warmup():", SamplingParams(max_tokens=16), f"warmup-{i}"
+                ):
+                    pass
+
+            await asyncio.gather(*(warmup(i) for i in range(8)))
+
+            # Exact-match LRU cache of greedy (temperature=0) responses; those
+            # are deterministic, so a repeat needs no GPU forward pass.
+            # Held only for dict operations, never across an await.
+            self._response_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+            self._response_cache_lock = threading.Lock()
 
             init_duration = time.time() - start_time
 
             logger.info(f"✓ Model loaded in {init_duration:.1f}s")
             logger.info(f"✓ Vocabulary size: {len(self.tokenizer)}")
-            logger.info(f"✓ Max model length: 8192 tokens")
-            logger.info(f"✓ Backend: llguidance via structured_outputs_config")
+            logger.info(f"✓ Max model length: {MAX_MODEL_LEN} tokens")
+            cache_config = (await self.engine.get_vllm_config()).cache_config
+            logger.info(
+                f"✓ KV cache: {cache_config.num_gpu_blocks} blocks of {cache_config.block_size} tokens"
+            )
+            logger.info(f"✓ Backend: {STRUCTURED_OUTPUTS_BACKEND} via structured_outputs_config")
 
         except Exception as e:
             logger.error(f"✗ Model initialization failed: {e}", exc_info=True)
@@ -252,8 +626,117 @@ class AnankeLLM:
                     logger.error("llguidance: installed (version unavailable)")
             raise RuntimeError(f"Failed to initialize vLLM: {e}") from e
 
+    def _build_sampling_params(self, request: GenerationRequest, request_id: str, logger):
+        """Build SamplingParams for a request.
+
+        Returns:
+            (sampling_params, constraint_type_used, constraint_satisfied)
+        """
+        import orjson
+        from vllm import SamplingParams
+
+        # Apply constraints if provided (using V1 StructuredOutputsParams API)
+        structured_outputs = None
+        constraint_satisfied = True
+        constraint_type_used = None
+
+        if request.constraints:
+            try:
+                constraint_spec = ConstraintSpec(**request.constraints)
+                llguidance_constraint = constraint_spec.to_llguidance()
+
+                if llguidance_constraint:
+                    constraint_type = llguidance_constraint["type"]
+                    constraint_type_used = constraint_type
+
+                    if constraint_type == "json":
+                        # Compact, and schema key order is kept: it sets the
+                        # order of generated fields
+                        payload = orjson.dumps(llguidance_constraint["schema"]).decode()
+                    elif constraint_type == "grammar":
+                        payload = llguidance_constraint["grammar"]
+                        if STRUCTURED_OUTPUTS_BACKEND == "xgrammar" and "::=" not in payload:
+                            raise ValueError(
+                                "xgrammar backend requires a GBNF grammar (::= rules)"
+                            )
+                    elif constraint_type == "regex":
+                        payload = llguidance_constraint["patterns"][0]
+                    else:
+                        payload = None
+                        logger.warning(f"[{request_id}] Constraint type {constraint_type} not supported")
+
+                    if payload is not None:
+                        structured_outputs = _structured_outputs_params(constraint_type, payload)
+                        logger.info(f"[{request_id}] Applied {constraint_type} constraint")
+            except Exception as e:
+                logger.error(f"[{request_id}] Constraint compilation failed: {e}")
+                # Continue without constraints rather than failing
+                constraint_satisfied = False
+                structured_outputs = None
+
+        sampling_params = SamplingParams(
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            top_k=request.top_k,
+            stop=request.stop_sequences,  # None: SamplingParams supplies its own empty list
+            structured_outputs=structured_outputs,
+        )
+
+        return sampling_params, constraint_type_used, constraint_satisfied
+
+    def _encode_prompt(self, request: GenerationRequest) -> List[int]:
+        """Tokenize a request's prompt, rejecting it if it cannot fit the context.
+
+        The prefix comes from the per-container prefix cache and only the
+        prompt itself is tokenized per request; the two are joined as token
+        IDs rather than as strings. The IDs are handed to the engine as-is,
+        so vLLM does not tokenize the prompt a second time.
+        """
+        max_tokens = request.max_tokens
+        prefix = request.prompt_prefix()
+        if prefix:
+            prompt_token_ids = list(self._encode_prefix(prefix))
+            prompt_token_ids.extend(
+                self.tokenizer.encode(request.prompt, add_special_tokens=False)
+            )
+        else:
+            prompt_token_ids = self.tokenizer.encode(request.prompt)
+        if len(prompt_token_ids) + max_tokens > MAX_MODEL_LEN:
+            raise ValueError(
+                f"Prompt ({len(prompt_token_ids)} tokens) plus max_tokens ({max_tokens}) "
+                f"exceeds the model context of {MAX_MODEL_LEN} tokens"
+            )
+        return prompt_token_ids
+
+    async def _run_engine(self, prompt_token_ids: List[int], sampling_params: Any) -> Any:
+        """Run one tokenized prompt through the engine and return its final RequestOutput.
+
+        Concurrent calls need no batching window of their own: each one adds
+        its request to the engine, whose scheduler merges everything pending
+        into the next step's batch.
+        """
+        final = None
+        async for output in self.engine.generate(
+            {"prompt_token_ids": prompt_token_ids}, sampling_params, _next_request_id()
+        ):
+            final = output
+        return final
+
+    def _error_result(self, error: Exception, request_id: str, start_time: float) -> Dict[str, Any]:
+        """Response dict for a failed generation, built from _ERROR_TEMPLATE"""
+        result = _ERROR_TEMPLATE.copy()
+        result["generation_time_ms"] = int((time.time() - start_time) * 1000)
+        result["model_name"] = self.model_name
+        result["metadata"] = {
+            "error": str(error),
+            "error_type": type(error).__name__,
+            "request_id": request_id,
+        }
+        return result
+
     @modal.method()
-    def generate(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate code with constraints.
 
@@ -263,14 +746,25 @@ class AnankeLLM:
         Returns:
             Dictionary containing GenerationResponse fields
         """
+        return await self._generate(request_data)
+
+    @modal.method()
+    async def generate_json(self, request_data: Dict[str, Any]) -> bytes:
+        """
+        Generate code with constraints, returning the response as JSON bytes.
+
+        HTTP endpoints relay the bytes as-is, so the response is serialized
+        once here instead of being pickled as a dict and re-encoded.
+        """
+        import orjson
+
+        return orjson.dumps(await self._generate(request_data))
+
+    async def _generate(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         import logging
-        import traceback
-        import uuid
-        from vllm import SamplingParams
-        from vllm.sampling_params import StructuredOutputsParams
 
         logger = logging.getLogger(__name__)
-        request_id = request_data.get('request_id', str(uuid.uuid4())[:8])
+        request_id = request_data.get('request_id') or _next_request_id()
         start_time = time.time()
 
         try:
@@ -281,108 +775,38 @@ class AnankeLLM:
                 logger.error(f"[{request_id}] Invalid request format: {e}")
                 raise ValueError(f"Invalid request format: {e}") from e
 
-            # Build prompt with context if provided
-            full_prompt = request.prompt
-            if request.context:
-                full_prompt = f"{request.context}\n\n{request.prompt}"
-
-            prompt_length = len(self.tokenizer.encode(full_prompt))
-            logger.info(f"[{request_id}] Starting generation: prompt_tokens={prompt_length}, max_tokens={request.max_tokens}")
-
-            # Apply constraints if provided (using V1 StructuredOutputsParams API)
-            constraint_satisfied = True
-            constraint_type_used = None
-
-            if request.constraints:
-                try:
-                    constraint_spec = ConstraintSpec(**request.constraints)
-                    llguidance_constraint = constraint_spec.to_llguidance()
-
-                    if llguidance_constraint:
-                        constraint_type = llguidance_constraint["type"]
-                        constraint_type_used = constraint_type
-
-                        # Use V1 StructuredOutputsParams API
-                        if constraint_type == "json":
-                            sampling_params = SamplingParams(
-                                max_tokens=request.max_tokens,
-                                temperature=request.temperature,
-                                top_p=request.top_p,
-                                top_k=request.top_k,
-                                stop=request.stop_sequences or [],
-                                structured_outputs=StructuredOutputsParams(
-                                    json=llguidance_constraint["schema"]  # Fixed: parameter is 'json' not 'json_schema'
-                                ),
-                            )
-                            logger.info(f"[{request_id}] Applied JSON schema constraint")
-                        elif constraint_type == "grammar":
-                            sampling_params = SamplingParams(
-                                max_tokens=request.max_tokens,
-                                temperature=request.temperature,
-                                top_p=request.top_p,
-                                top_k=request.top_k,
-                                stop=request.stop_sequences or [],
-                                structured_outputs=StructuredOutputsParams(
-                                    grammar=llguidance_constraint["grammar"]
-                                ),
-                            )
-                            logger.info(f"[{request_id}] Applied grammar constraint")
-                        elif constraint_type == "regex":
-                            sampling_params = SamplingParams(
-                                max_tokens=request.max_tokens,
-                                temperature=request.temperature,
-                                top_p=request.top_p,
-                                top_k=request.top_k,
-                                stop=request.stop_sequences or [],
-                                structured_outputs=StructuredOutputsParams(
-                                    regex=llguidance_constraint["patterns"][0]
-                                ),
-                            )
-                            logger.info(f"[{request_id}] Applied regex constraint")
-                        else:
-                            # No constraint support for this type
-                            sampling_params = SamplingParams(
-                                max_tokens=request.max_tokens,
-                                temperature=request.temperature,
-                                top_p=request.top_p,
-                                top_k=request.top_k,
-                                stop=request.stop_sequences or [],
-                            )
-                            logger.warning(f"[{request_id}] Constraint type {constraint_type} not supported")
-                    else:
-                        # No constraints
-                        sampling_params = SamplingParams(
-                            max_tokens=request.max_tokens,
-                            temperature=request.temperature,
-                            top_p=request.top_p,
-                            top_k=request.top_k,
-                            stop=request.stop_sequences or [],
-                        )
-                except Exception as e:
-                    logger.error(f"[{request_id}] Constraint compilation failed: {e}")
-                    # Continue without constraints rather than failing
-                    constraint_satisfied = False
-                    sampling_params = SamplingParams(
-                        max_tokens=request.max_tokens,
-                        temperature=request.temperature,
-                        top_p=request.top_p,
-                        top_k=request.top_k,
-                        stop=request.stop_sequences or [],
-                    )
-            else:
-                # No constraints requested
-                sampling_params = SamplingParams(
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    top_p=request.top_p,
-                    top_k=request.top_k,
-                    stop=request.stop_sequences or [],
-                )
+            # Serve repeated deterministic requests from the response cache
+            cache_key = None
+            if request.temperature == 0:
+                cache_key = _response_cache_key(request.full_prompt(), request)
+                with self._response_cache_lock:
+                    cached = self._response_cache.get(cache_key)
+                    if cached is not None:
+                        self._response_cache.move_to_end(cache_key)
+                if cached is not None:
+                    logger.info(f"[{request_id}] Response cache hit")
+                    return {
+                        **cached,
+                        "generation_time_ms": int((time.time() - start_time) * 1000),
+                        "metadata": {
+                            **cached["metadata"],
+                            "request_id": request_id,
+                            "cache_hit": True,
+                        },
+                    }
+
+            prompt_token_ids = self._encode_prompt(request)
+            prompt_length = len(prompt_token_ids)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[{request_id}] Starting generation: prompt_tokens={prompt_length}, max_tokens={request.max_tokens}")
+
+            sampling_params, constraint_type_used, constraint_satisfied = (
+                self._build_sampling_params(request, request_id, logger)
+            )
 
             # Generate with vLLM
             try:
-                outputs = self.llm.generate([full_prompt], sampling_params)
-                output = outputs[0]
+                output = await self._run_engine(prompt_token_ids, sampling_params)
 
                 generated_text = output.outputs[0].text
                 tokens_generated = len(output.outputs[0].token_ids)
@@ -393,26 +817,15 @@ class AnankeLLM:
 
                 logger.info(
                     f"[{request_id}] Generation complete: "
+                    f"prompt_tokens={prompt_length}, "
                     f"tokens={tokens_generated}, time={generation_time_ms}ms, "
                     f"speed={tokens_per_sec:.1f} tok/s, reason={finish_reason}"
                 )
 
             except Exception as e:
-                logger.error(f"[{request_id}] Generation failed: {e}")
-                logger.error(f"[{request_id}] Traceback: {traceback.format_exc()}")
-                return asdict(GenerationResponse(
-                    generated_text="",
-                    tokens_generated=0,
-                    generation_time_ms=int((time.time() - start_time) * 1000),
-                    constraint_satisfied=False,
-                    model_name=self.model_name,
-                    finish_reason="error",
-                    metadata={
-                        "error": str(e),
-                        "error_type": type(e).__name__,
-                        "request_id": request_id,
-                    },
-                ))
+                # Traceback is formatted by the logging handler, once, only if emitted
+                logger.exception(f"[{request_id}] Generation failed: {e}")
+                return self._error_result(e, request_id, start_time)
 
             generation_time_ms = int((time.time() - start_time) * 1000)
 
@@ -434,24 +847,65 @@ class AnankeLLM:
                 },
             )
 
-            return asdict(response)
+            result = response.to_dict()
+            if cache_key is not None:
+                with self._response_cache_lock:
+                    self._response_cache[cache_key] = result
+                    if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+
+            return result
 
         except Exception as e:
-            logger.error(f"[{request_id}] Unexpected error: {e}")
-            logger.error(f"[{request_id}] Traceback: {traceback.format_exc()}")
-            return asdict(GenerationResponse(
-                generated_text="",
-                tokens_generated=0,
-                generation_time_ms=int((time.time() - start_time) * 1000),
-                constraint_satisfied=False,
-                model_name=self.model_name,
-                finish_reason="error",
-                metadata={
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "request_id": request_id,
-                },
-            ))
+            logger.exception(f"[{request_id}] Unexpected error: {e}")
+            return self._error_result(e, request_id, start_time)
+
+    @modal.method()
+    async def generate_stream(self, request_data: Dict[str, Any]):
+        """
+        Stream generated text as the engine produces it.
+
+        Yields {"token": <text delta>, "done": False} per engine step, then a
+        final {"token": "", "done": True, "finish_reason", "tokens_generated"}.
+        Failures end the stream with {"error": <message>, "done": True}.
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        request_id = request_data.get('request_id') or _next_request_id()
+
+        try:
+            request = GenerationRequest.from_dict(request_data)
+            prompt_token_ids = self._encode_prompt(request)
+            sampling_params, _, _ = self._build_sampling_params(request, request_id, logger)
+
+            # Outputs are cumulative; send only the text added since the last step
+            sent = 0
+            output = None
+            engine_request_id = _next_request_id()
+            try:
+                async for output in self.engine.generate(
+                    {"prompt_token_ids": prompt_token_ids}, sampling_params, engine_request_id
+                ):
+                    text = output.outputs[0].text
+                    if len(text) > sent:
+                        yield {"token": text[sent:], "done": False}
+                        sent = len(text)
+            finally:
+                # The consumer went away mid-stream (client disconnected or
+                # stopped reading): stop decoding to free the GPU slot
+                if output is None or not output.finished:
+                    await self.engine.abort(engine_request_id)
+
+            completion = output.outputs[0]
+            yield {
+                "token": "",
+                "done": True,
+                "finish_reason": completion.finish_reason,
+                "tokens_generated": len(completion.token_ids),
+            }
+        except Exception as e:
+            logger.error(f"[{request_id}] Streaming generation failed: {e}", exc_info=True)
+            yield {"error": str(e), "done": True}
 
     @modal.method()
     def health_check(self) -> Dict[str, Any]:
@@ -459,13 +913,20 @@ class AnankeLLM:
         return {
             "status": "healthy",
             "model": self.model_name,
-            "backend": "vLLM 0.11.0 + llguidance",
-            "gpu": "A100-80GB",
+            "backend": f"vLLM 0.11.0 + {STRUCTURED_OUTPUTS_BACKEND}",
+            "gpu": GPU_CONFIG,
+            "quantization": QUANT_MODE,
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _llm_handle() -> "AnankeLLM":
+    """Remote AnankeLLM handle shared by all requests an endpoint container serves"""
+    return AnankeLLM()
+
+
 @app.function(
-    image=vllm_image,
+    image=cpu_image,
     timeout=10,
 )
 @modal.fastapi_endpoint(method="GET")
@@ -479,14 +940,19 @@ def health():
 
 
 @app.function(
-    image=vllm_image,
-    timeout=3600,  # 1 hour timeout (same as class, handles first-time download)
+    image=cpu_image,
+    timeout=3600,  # 1 hour timeout (same as class)
 )
 @modal.fastapi_endpoint(method="POST")
-def generate_api(request: Dict[str, Any]) -> Dict[str, Any]:
+async def generate_api(http_request: "Request"):
     """
     HTTP API endpoint for constrained generation (custom format).
 
+    Request bodies may be sent with `Content-Encoding: gzip`; responses
+    are gzipped when the client sends `Accept-Encoding: gzip`. Retries that
+    repeat an `Idempotency-Key` header, or a greedy (temperature 0) payload,
+    within DEDUP_TTL_S get the earlier response.
+
     POST /generate_api
     {
         "prompt": "Implement secure API handler",
@@ -500,8 +966,97 @@ def generate_api(request: Dict[str, Any]) -> Dict[str, Any]:
         ...
     }
     """
-    llm = AnankeLLM()
-    return llm.generate.remote(request)
+    import orjson
+    from fastapi import HTTPException, Response
+
+    raw = await http_request.body()
+    try:
+        if http_request.headers.get("content-encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        request = orjson.loads(raw)
+    except (OSError, EOFError, orjson.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {e}")
+    if not isinstance(request, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+
+    # Large generations compress well; gzip them when the client allows it
+    accepts_gzip = "gzip" in http_request.headers.get("accept-encoding", "")
+
+    def json_response(body: bytes) -> Response:
+        if accepts_gzip and len(body) >= COMPRESS_MIN_BYTES:
+            return Response(
+                content=gzip.compress(body, compresslevel=5),
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        return Response(content=body, media_type="application/json")
+
+    # Reject malformed requests before they can wake the GPU container. The
+    # schema check compiles the schema in llguidance, so it runs on a worker
+    # thread rather than stalling every other request this container serves
+    error = await asyncio.to_thread(_prefilter_error, request)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    # Short-lived dedup of retries, shared across endpoint containers. Only
+    # greedy requests (same payload, same output) or requests carrying an
+    # Idempotency-Key are deduped; others skip the Dict round trip entirely.
+    idempotency_key = http_request.headers.get("idempotency-key")
+    dedup_key = None
+    if idempotency_key:
+        dedup_key = "key:" + hashlib.sha256(idempotency_key.encode()).hexdigest()
+    elif request.get("temperature", 0.7) == 0:
+        dedup_key = "body:" + hashlib.sha256(
+            orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+
+    if dedup_key is not None:
+        recent = modal.Dict.from_name("ananke-recent-responses", create_if_missing=True)
+        cached = await recent.get.aio(dedup_key)
+        if cached is not None:
+            if time.time() - cached[0] < DEDUP_TTL_S:
+                return json_response(cached[1])
+            # Expired: drop it so the shared Dict does not accumulate stale
+            # responses (a concurrent reader may have removed it already)
+            try:
+                await recent.pop.aio(dedup_key)
+            except KeyError:
+                pass
+
+    llm = _llm_handle()
+    body = await llm.generate_json.remote.aio(request)
+
+    # Quotes inside JSON strings are escaped, so this literal can only be
+    # the response's own finish_reason
+    if dedup_key is not None and b'"finish_reason":"error"' not in body:
+        await recent.put.aio(dedup_key, (time.time(), body))
+    return json_response(body)
+
+
+@app.function(
+    image=cpu_image,
+    timeout=3600,
+)
+@modal.fastapi_endpoint(method="POST")
+async def generate_stream_api(request: Dict[str, Any]):
+    """
+    Streaming variant of generate_api using Server-Sent Events.
+
+    Takes the same body as generate_api. Each event is
+    `data: {"token": "...", "done": false}`; the last JSON event has
+    "done": true, and the stream ends with `data: [DONE]`.
+    """
+    import orjson
+    from fastapi.responses import StreamingResponse
+
+    llm = _llm_handle()
+
+    async def events():
+        async for chunk in llm.generate_stream.remote_gen.aio(request):
+            yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 def _build_context_prompt(constraint_spec: Dict[str, Any]) -> str:
@@ -562,11 +1117,11 @@ def _build_context_prompt(constraint_spec: Dict[str, Any]) -> str:
 
 
 @app.function(
-    image=vllm_image,
+    image=cpu_image,
     timeout=3600,
 )
 @modal.fastapi_endpoint(method="POST", label="v1-chat-completions")
-def v1_chat_completions(request: Dict[str, Any]) -> Dict[str, Any]:
+async def v1_chat_completions(http_request: "Request"):
     """
     OpenAI-compatible /v1/chat/completions endpoint with constraint_spec extension.
 
@@ -575,11 +1130,20 @@ def v1_chat_completions(request: Dict[str, Any]) -> Dict[str, Any]:
     containing CLaSH domain context for constrained decoding.
     """
     import time as _time
-    import uuid
 
-    request_id = str(uuid.uuid4())[:8]
+    import orjson
+    from fastapi import HTTPException, Response
+
+    request_id = _next_request_id()
     start_time = _time.time()
 
+    try:
+        request = orjson.loads(await http_request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {e}")
+    if not isinstance(request, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+
     # Extract OpenAI fields
     messages = request.get("messages", [])
     model = request.get("model", "default")
@@ -622,13 +1186,17 @@ def v1_chat_completions(request: Dict[str, Any]) -> Dict[str, Any]:
         internal_request["constraints"] = constraints
 
     # Call the LLM
-    llm = AnankeLLM()
-    result = llm.generate.remote(internal_request)
+    llm = _llm_handle()
+    result = await llm.generate.remote.aio(internal_request)
 
     generation_time_ms = int((_time.time() - start_time) * 1000)
 
-    # Map to OpenAI-compatible response
-    return {
+    # Token counts come from the single tokenization done for the engine
+    prompt_tokens = (result.get("metadata") or {}).get("prompt_tokens", 0)
+    completion_tokens = result.get("tokens_generated", 0)
+
+    # Map to OpenAI-compatible response, serialized directly by orjson
+    body = {
         "id": f"chatcmpl-{request_id}",
         "object": "chat.completion",
         "model": result.get("model_name", model),
@@ -643,59 +1211,13 @@ def v1_chat_completions(request: Dict[str, Any]) -> Dict[str, Any]:
             }
         ],
         "usage": {
-            "prompt_tokens": 0,
-            "completion_tokens": result.get("tokens_generated", 0),
-            "total_tokens": result.get("tokens_generated", 0),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
         },
         "constraint_spec_applied": bool(constraint_spec),
         "domains_active": [k for k in constraint_spec if k not in ("language",)],
         "generation_time_ms": generation_time_ms,
     }
+    return Response(content=orjson.dumps(body), media_type="application/json")
 
-
-# Local development helper
-@app.local_entrypoint()
-def main():
-    """Test the service locally"""
-    print("Testing Ananke Inference Service...")
-
-    # Test health check
-    print("\n1. Testing health check...")
-    health_result = health.remote()
-    print(f"Health: {json.dumps(health_result, indent=2)}")
-
-    # Test simple generation
-    print("\n2. Testing simple generation...")
-    simple_request = {
-        "prompt": "Write a Python function to add two numbers:",
-        "max_tokens": 100,
-        "temperature": 0.7,
-    }
-
-    llm = AnankeLLM()
-    simple_result = llm.generate.remote(simple_request)
-    print(f"Result: {json.dumps(simple_result, indent=2)}")
-
-    # Test constrained generation with JSON schema
-    print("\n3. Testing JSON schema constraint...")
-    json_request = {
-        "prompt": "Generate a user profile:",
-        "constraints": {
-            "json_schema": {
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string"},
-                    "age": {"type": "integer"},
-                    "email": {"type": "string"},
-                },
-                "required": ["name", "age"],
-            }
-        },
-        "max_tokens": 100,
-        "temperature": 0.7,
-    }
-
-    json_result = llm.generate.remote(json_request)
-    print(f"Result: {json.dumps(json_result, indent=2)}")
-
-    print("\n✓ All tests completed!")
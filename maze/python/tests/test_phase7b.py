@@ -12,6 +12,10 @@ Tests the enhanced Ananke Python API including:
 import pytest
 import sys
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
 def test_import_all_phase7b_components():
@@ -389,6 +393,161 @@ async def test_multiple_constraints_compilation():
         pytest.skip("Ananke module not built yet")
 
 
+@pytest.mark.asyncio
+async def test_compile_constraints_many():
+    """Test compiling several constraint sets in one call"""
+    try:
+        from ananke import Ananke, PyConstraintIR
+
+        ananke = Ananke(
+            modal_endpoint="https://test.modal.run",
+            modal_api_key="test_key",
+            enable_cache=True
+        )
+
+        await ananke.clear_cache()
+
+        first = PyConstraintIR(name="first", json_schema='{"type": "string"}')
+        second = PyConstraintIR(name="second", json_schema='{"type": "integer"}')
+
+        results = await ananke.compile_constraints_many([[first], [second], [first]])
+
+        assert isinstance(results, list), "Result should be a list"
+        assert len(results) == 3, "Should return one result per constraint set"
+        for result in results:
+            assert {"hash", "compiled_at", "schema"} <= set(result)
+
+        # Results keep input order; repeated sets hit the same cache entry
+        assert results[0]["hash"] == results[2]["hash"]
+        assert results[0]["hash"] != results[1]["hash"]
+
+        single = await ananke.compile_constraints([first])
+        assert single["hash"] == results[0]["hash"]
+
+        stats = await ananke.cache_stats()
+        assert stats["size"] == 2, "Should have one cache entry per distinct set"
+
+    except ImportError:
+        pytest.skip("Ananke module not built yet")
+
+
+@pytest.mark.asyncio
+async def test_from_env_reuses_orchestrator(monkeypatch):
+    """Test that from_env instances with the same environment share a cache"""
+    try:
+        from ananke import Ananke, PyConstraintIR
+
+        monkeypatch.setenv("MODAL_ENDPOINT", "https://test.modal.run")
+        monkeypatch.setenv("MODAL_API_KEY", "test_key")
+
+        first = Ananke.from_env()
+        second = Ananke.from_env()
+        assert first is not second, "Each call should return a new Ananke instance"
+
+        await first.clear_cache()
+        constraint = PyConstraintIR(name="shared", json_schema='{"type": "string"}')
+        await first.compile_constraints([constraint])
+
+        stats = await second.cache_stats()
+        assert stats["size"] == 1, "Second instance should see the first one's cache entry"
+
+        # Clearing through either instance clears the shared cache
+        await second.clear_cache()
+        stats = await first.cache_stats()
+        assert stats["size"] == 0
+
+        # A different environment builds its own orchestrator and cache
+        monkeypatch.setenv("MODAL_ENDPOINT", "https://other.modal.run")
+        other = Ananke.from_env()
+        await first.compile_constraints([constraint])
+        stats = await other.cache_stats()
+        assert stats["size"] == 0, "Different environments should not share a cache"
+
+    except ImportError:
+        pytest.skip("Ananke module not built yet")
+
+
+def test_stream_generate_returns_async_iterator():
+    """Test that stream_generate returns an async iterator without sending a request"""
+    try:
+        from ananke import Ananke, PyGenerationRequest
+
+        ananke = Ananke(
+            modal_endpoint="https://test.modal.run",
+            modal_api_key="test_key"
+        )
+
+        request = PyGenerationRequest(prompt="def add(a, b):", max_tokens=16)
+        stream = ananke.stream_generate(request)
+
+        # The request is only sent on the first __anext__, so this needs no network
+        assert stream.__aiter__() is stream
+        assert callable(getattr(stream, '__anext__')), "__anext__() is not callable"
+
+    except ImportError:
+        pytest.skip("Ananke module not built yet")
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    """Serves the Modal streaming endpoint's SSE frames, one write per frame"""
+
+    frames = [
+        {"token": "def", "done": False},
+        {"token": " add", "done": False},
+        {"token": "(a, b):", "done": False},
+        {"token": "", "done": True},
+    ]
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        _SSEHandler.requests.append((self.path, json.loads(body)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for frame in self.frames:
+            self.wfile.write(b"data: " + json.dumps(frame).encode() + b"\n\n")
+            self.wfile.flush()
+            # Separate reads on the client side, one frame each
+            time.sleep(0.05)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_stream_generate_iterates_chunks():
+    """Test iterating stream_generate against a local SSE endpoint"""
+    try:
+        from ananke import Ananke, PyGenerationRequest
+    except ImportError:
+        pytest.skip("Ananke module not built yet")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        ananke = Ananke(modal_endpoint=f"http://127.0.0.1:{server.server_address[1]}")
+        request = PyGenerationRequest(prompt="def add(a, b):", max_tokens=16)
+
+        chunks = [chunk async for chunk in ananke.stream_generate(request)]
+
+        path, body = _SSEHandler.requests[-1]
+        assert path == "/generate/stream"
+        assert body["prompt"] == "def add(a, b):"
+        assert body["stream"] is True
+
+        assert "".join(chunk.text for chunk in chunks) == "def add(a, b):"
+        assert chunks[-1].is_final, "Stream should end with the final chunk"
+        assert not any(chunk.is_final for chunk in chunks[:-1])
+        timestamps = [chunk.timestamp_ms for chunk in chunks]
+        assert timestamps == sorted(timestamps)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 @pytest.mark.asyncio
 async def test_ananke_repr_and_str():
     """Test that Ananke has proper string representations"""
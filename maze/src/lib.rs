@@ -50,6 +50,8 @@ use lru::LruCache;
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 use std::num::NonZeroUsize;
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU64, Ordering};
 use std::sync::Arc;
 use tokio::sync::Mutex;
 
@@ -81,6 +83,10 @@ pub struct MazeOrchestrator {
     /// Uses LRU eviction policy for O(1) cache operations
     constraint_cache: Arc<Mutex<LruCache<String, CompiledConstraint>>>,
 
+    /// Optional on-disk second tier for the constraint cache, so compiled
+    /// constraints survive process restarts (one `<hash>.json` file per entry)
+    persistent_cache_dir: Option<PathBuf>,
+
     /// Configuration
     config: MazeConfig,
 }
@@ -241,6 +247,7 @@ impl MazeOrchestrator {
         Ok(Self {
             modal_client,
             constraint_cache: Arc::new(Mutex::new(LruCache::new(cache_size))),
+            persistent_cache_dir: None,
             config: default_config,
         })
     }
@@ -255,10 +262,30 @@ impl MazeOrchestrator {
         Ok(Self {
             modal_client,
             constraint_cache: Arc::new(Mutex::new(LruCache::new(cache_size))),
+            persistent_cache_dir: None,
             config: maze_config,
         })
     }
 
+    /// Back the in-memory constraint cache with a directory on disk
+    ///
+    /// On an in-memory miss the directory is checked before compiling, and
+    /// every fresh compilation is written to it. Entries are keyed by the
+    /// canonical cache key under a per-version subdirectory, so they stay
+    /// valid across process restarts.
+    pub fn with_persistent_cache(mut self, dir: impl AsRef<Path>) -> Result<Self> {
+        // Entries from other versions may have been compiled differently
+        let dir = dir.as_ref().join(concat!("v", env!("CARGO_PKG_VERSION")));
+        std::fs::create_dir_all(&dir).with_context(|| {
+            format!(
+                "Failed to create constraint cache directory {}",
+                dir.display()
+            )
+        })?;
+        self.persistent_cache_dir = Some(dir);
+        Ok(self)
+    }
+
     /// Generate code with constraints
     ///
     /// This is the main entry point for constrained code generation.
@@ -348,6 +375,29 @@ impl MazeOrchestrator {
         })
     }
 
+    /// Generate code with constraints, streaming tokens as they arrive
+    ///
+    /// Constraints are compiled (or served from the cache) exactly as by
+    /// `generate`; the returned stream yields chunks from the Modal streaming
+    /// endpoint, so callers see the first tokens without waiting for the
+    /// whole completion.
+    pub async fn generate_stream(&self, request: GenerationRequest) -> Result<StreamingResult> {
+        let compiled = self.compile_constraints(&request.constraints_ir).await?;
+
+        let modal_request = modal_client::InferenceRequest {
+            prompt: request.prompt,
+            constraints: compiled.llguidance_schema,
+            max_tokens: request.max_tokens,
+            temperature: request.temperature,
+            context: request.context,
+        };
+
+        self.modal_client
+            .generate_stream(modal_request)
+            .await
+            .context("Failed to start streaming generation with Modal inference service")
+    }
+
     /// Compile constraints to llguidance format with caching
     /// Uses LRU cache for O(1) eviction instead of O(n) linear scan
     pub async fn compile_constraints(
@@ -366,6 +416,18 @@ impl MazeOrchestrator {
             }
         }
 
+        // Fall back to the on-disk tier and promote hits into memory
+        if self.config.enable_cache {
+            if let Some(dir) = &self.persistent_cache_dir {
+                if let Some(cached) = load_persisted_constraint(dir, &cache_key).await {
+                    tracing::debug!("Disk cache hit for constraints: {}", cache_key);
+                    let mut cache = self.constraint_cache.lock().await;
+                    cache.put(cache_key, cached.clone());
+                    return Ok(cached);
+                }
+            }
+        }
+
         // Compile constraints
         let llguidance_schema = self.compile_to_llguidance(constraints_ir)?;
 
@@ -378,6 +440,14 @@ impl MazeOrchestrator {
         // Store in cache if enabled
         // LRU cache automatically handles eviction with O(1) complexity
         if self.config.enable_cache {
+            if let Some(dir) = &self.persistent_cache_dir {
+                // The disk tier is best-effort: a failed write only costs a
+                // recompilation in a later process
+                if let Err(e) = persist_constraint(dir, &compiled).await {
+                    tracing::warn!("Failed to persist compiled constraints: {}", e);
+                }
+            }
+
             let mut cache = self.constraint_cache.lock().await;
             cache.put(cache_key, compiled.clone());
         }
@@ -385,14 +455,35 @@ impl MazeOrchestrator {
         Ok(compiled)
     }
 
+    /// Compile several independent constraint sets in one call
+    ///
+    /// Each set is compiled (or served from the cache) exactly as by
+    /// `compile_constraints`, and results are returned in input order.
+    /// Identical sets within a batch share one cache entry.
+    pub async fn compile_constraints_batch(
+        &self,
+        batches: &[Vec<ConstraintIR>],
+    ) -> Result<Vec<CompiledConstraint>> {
+        let mut results = Vec::with_capacity(batches.len());
+        for constraints_ir in batches {
+            results.push(self.compile_constraints(constraints_ir).await?);
+        }
+        Ok(results)
+    }
+
     /// Generate cache key from constraint IR
     /// Uses xxHash3 for high-performance hashing (2-3x faster than DefaultHasher)
+    ///
+    /// The IR is canonicalized before hashing: converting to `serde_json::Value`
+    /// sorts object keys, so schemas whose properties differ only in order
+    /// (e.g. `HashMap` iteration order) map to the same key.
     pub fn generate_cache_key(&self, constraints_ir: &[ConstraintIR]) -> Result<String> {
         use std::hash::Hasher;
         use xxhash_rust::xxh3::Xxh3;
 
-        let json = serde_json::to_string(constraints_ir)
+        let canonical = serde_json::to_value(constraints_ir)
             .context("Failed to serialize constraints for caching")?;
+        let json = canonical.to_string();
 
         let mut hasher = Xxh3::new();
         hasher.write(json.as_bytes());
@@ -473,7 +564,10 @@ impl MazeOrchestrator {
         Ok(schema)
     }
 
-    /// Clear the constraint cache
+    /// Clear the in-memory constraint cache
+    ///
+    /// Entries in the persistent tier are left in place; they are keyed by
+    /// content and compiler version, so they never go stale.
     pub async fn clear_cache(&self) -> Result<()> {
         let mut cache = self.constraint_cache.lock().await;
         cache.clear();
@@ -497,6 +591,42 @@ impl MazeOrchestrator {
     }
 }
 
+/// Read a compiled constraint from the on-disk cache tier
+///
+/// Missing or unreadable entries are treated as a miss.
+async fn load_persisted_constraint(dir: &Path, cache_key: &str) -> Option<CompiledConstraint> {
+    let bytes = tokio::fs::read(dir.join(format!("{}.json", cache_key)))
+        .await
+        .ok()?;
+    serde_json::from_slice(&bytes).ok()
+}
+
+/// Per-process counter that makes each temporary cache file name unique
+static PERSIST_WRITE_SEQ: AtomicU64 = AtomicU64::new(0);
+
+/// Write a compiled constraint to the on-disk cache tier
+///
+/// The entry is written to a temporary file and renamed into place so
+/// concurrent readers never observe a partially written file. The temporary
+/// name carries the process ID and a per-write sequence number, so
+/// concurrent writers of the same hash, in this process or another, never
+/// share a temporary file.
+async fn persist_constraint(dir: &Path, compiled: &CompiledConstraint) -> Result<()> {
+    let bytes = serde_json::to_vec(compiled)?;
+    let path = dir.join(format!("{}.json", compiled.hash));
+    let seq = PERSIST_WRITE_SEQ.fetch_add(1, Ordering::Relaxed);
+    let tmp_path = dir.join(format!(
+        "{}.json.{}.{}.tmp",
+        compiled.hash,
+        std::process::id(),
+        seq
+    ));
+
+    tokio::fs::write(&tmp_path, &bytes).await?;
+    tokio::fs::rename(&tmp_path, &path).await?;
+    Ok(())
+}
+
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct CacheStats {
     pub size: usize,
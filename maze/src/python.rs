@@ -3,16 +3,18 @@
 //! Exposes Rust types and functions to Python via PyO3.
 //! Provides async/await support through pyo3-async-runtimes.
 
-use pyo3::exceptions::PyRuntimeError;
+use futures::StreamExt;
+use pyo3::exceptions::{PyRuntimeError, PyStopAsyncIteration};
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::types::{PyDict, PyList};
 use pyo3_async_runtimes::tokio::future_into_py;
 use std::collections::HashMap;
-use std::sync::Arc;
+use std::path::PathBuf;
+use std::sync::{Arc, Mutex, OnceLock};
 
 use crate::{
-    ffi::ConstraintIR, GenerationContext, GenerationRequest, GenerationResponse, MazeConfig,
-    MazeOrchestrator, ModalConfig,
+    ffi::ConstraintIR, CompiledConstraint, GenerationContext, GenerationRequest,
+    GenerationResponse, MazeConfig, MazeOrchestrator, ModalConfig, StreamingResult,
 };
 
 /// Python wrapper for ModalConfig
@@ -193,7 +195,7 @@ impl PyGenerationRequest {
 }
 
 /// Python wrapper for Provenance
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Clone)]
 pub struct PyProvenance {
     #[pyo3(get)]
@@ -222,7 +224,7 @@ impl PyProvenance {
 }
 
 /// Python wrapper for ValidationResult
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Clone)]
 pub struct PyValidationResult {
     #[pyo3(get)]
@@ -248,7 +250,7 @@ impl PyValidationResult {
 }
 
 /// Python wrapper for GenerationMetadata
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Clone)]
 pub struct PyGenerationMetadata {
     #[pyo3(get)]
@@ -275,7 +277,7 @@ impl PyGenerationMetadata {
 }
 
 /// Python wrapper for GenerationResponse
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Clone)]
 pub struct PyGenerationResponse {
     #[pyo3(get)]
@@ -303,6 +305,109 @@ impl PyGenerationResponse {
     }
 }
 
+/// Python wrapper for StreamChunk
+#[pyclass(frozen)]
+#[derive(Clone)]
+pub struct PyStreamChunk {
+    #[pyo3(get)]
+    pub text: String,
+
+    #[pyo3(get)]
+    pub is_final: bool,
+
+    #[pyo3(get)]
+    pub token_index: usize,
+
+    #[pyo3(get)]
+    pub timestamp_ms: u64,
+}
+
+#[pymethods]
+impl PyStreamChunk {
+    fn __repr__(&self) -> String {
+        format!(
+            "PyStreamChunk(text={:?}, is_final={}, token_index={})",
+            self.text, self.is_final, self.token_index
+        )
+    }
+
+    fn __str__(&self) -> String {
+        self.text.clone()
+    }
+}
+
+/// State behind a `PyGenerationStream`: the request until the first
+/// `__anext__` starts it, then the live token stream
+struct StreamState {
+    request: Option<GenerationRequest>,
+    stream: Option<StreamingResult>,
+}
+
+/// Async iterator over the chunks of a streaming generation
+///
+/// Returned by `Ananke.stream_generate`. The HTTP request is sent on the
+/// first iteration, so the iterator can be created outside a running loop.
+#[pyclass]
+pub struct PyGenerationStream {
+    orchestrator: Arc<MazeOrchestrator>,
+    state: Arc<tokio::sync::Mutex<StreamState>>,
+}
+
+#[pymethods]
+impl PyGenerationStream {
+    fn __aiter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __anext__<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        let orch = self.orchestrator.clone();
+        let state = self.state.clone();
+
+        future_into_py(py, async move {
+            let mut state = state.lock().await;
+
+            if let Some(request) = state.request.take() {
+                let stream = orch.generate_stream(request).await.map_err(|e| {
+                    PyRuntimeError::new_err(format!("Streaming generation failed: {}", e))
+                })?;
+                state.stream = Some(stream);
+            }
+
+            let next = match state.stream.as_mut() {
+                Some(stream) => stream.next().await,
+                None => None,
+            };
+
+            match next {
+                Some(Ok(chunk)) => Ok(PyStreamChunk {
+                    text: chunk.text,
+                    is_final: chunk.is_final,
+                    token_index: chunk.token_index,
+                    timestamp_ms: chunk.timestamp_ms,
+                }),
+                Some(Err(e)) => Err(PyRuntimeError::new_err(format!(
+                    "Streaming generation failed: {}",
+                    e
+                ))),
+                None => {
+                    // Drop the connection once the stream is exhausted
+                    state.stream = None;
+                    Err(PyStopAsyncIteration::new_err(()))
+                }
+            }
+        })
+    }
+}
+
+/// Environment values an `Ananke.from_env` orchestrator was built from:
+/// endpoint, API key, model and cache size
+type FromEnvKey = (String, Option<String>, String, usize);
+
+/// Orchestrators built by `Ananke.from_env`, shared by every instance
+/// created from the same environment
+static FROM_ENV_ORCHESTRATORS: OnceLock<Mutex<HashMap<FromEnvKey, Arc<MazeOrchestrator>>>> =
+    OnceLock::new();
+
 /// Main Python API class for Ananke
 ///
 /// This wraps the Rust MazeOrchestrator and provides a Pythonic async interface.
@@ -325,6 +430,8 @@ impl Ananke {
     ///     timeout_secs (int): Request timeout in seconds. Defaults to 300 (5 minutes).
     ///     enable_cache (bool): Enable constraint compilation caching for performance. Defaults to True.
     ///     cache_size (int): Maximum number of compiled constraints to cache (LRU eviction). Defaults to 1000.
+    ///     persistent_cache_dir (Optional[str]): Directory for an on-disk second tier of the constraint
+    ///         cache, so compiled constraints survive process restarts. Defaults to None (memory only).
     ///
     /// Returns:
     ///     Ananke: An initialized Ananke orchestrator instance.
@@ -344,7 +451,7 @@ impl Ananke {
     ///     # )
     ///     ```
     #[new]
-    #[pyo3(signature = (modal_endpoint, modal_api_key=None, model="meta-llama/Llama-3.1-8B-Instruct".to_string(), timeout_secs=300, enable_cache=true, cache_size=1000))]
+    #[pyo3(signature = (modal_endpoint, modal_api_key=None, model="meta-llama/Llama-3.1-8B-Instruct".to_string(), timeout_secs=300, enable_cache=true, cache_size=1000, persistent_cache_dir=None))]
     fn new(
         modal_endpoint: String,
         modal_api_key: Option<String>,
@@ -352,6 +459,7 @@ impl Ananke {
         timeout_secs: u64,
         enable_cache: bool,
         cache_size: usize,
+        persistent_cache_dir: Option<PathBuf>,
     ) -> PyResult<Self> {
         let modal_config = ModalConfig {
             endpoint_url: modal_endpoint,
@@ -370,11 +478,17 @@ impl Ananke {
             timeout_secs,
         };
 
-        let orchestrator =
+        let mut orchestrator =
             MazeOrchestrator::with_config(modal_config, maze_config).map_err(|e| {
                 PyRuntimeError::new_err(format!("Failed to initialize Maze orchestrator: {}", e))
             })?;
 
+        if let Some(dir) = persistent_cache_dir {
+            orchestrator = orchestrator.with_persistent_cache(dir).map_err(|e| {
+                PyRuntimeError::new_err(format!("Failed to open persistent cache: {}", e))
+            })?;
+        }
+
         Ok(Self {
             orchestrator: Arc::new(orchestrator),
         })
@@ -391,6 +505,11 @@ impl Ananke {
     ///     - MODAL_MODEL (optional): Model name (default: "meta-llama/Llama-3.1-8B-Instruct")
     ///     - ANANKE_CACHE_SIZE (optional): Cache size (default: 1000)
     ///
+    /// Instances created from the same environment values share one underlying
+    /// orchestrator, so its HTTP connection pool and constraint cache are
+    /// reused rather than rebuilt on every call. Because the cache is shared,
+    /// `clear_cache()` on any of these instances empties it for all of them.
+    ///
     /// Returns:
     ///     Ananke: An initialized Ananke orchestrator instance.
     ///
@@ -421,6 +540,23 @@ impl Ananke {
             .and_then(|s| s.parse().ok())
             .unwrap_or(1000);
 
+        let key = (
+            modal_config.endpoint_url.clone(),
+            modal_config.api_key.clone(),
+            modal_config.model.clone(),
+            cache_size,
+        );
+        let mut orchestrators = FROM_ENV_ORCHESTRATORS
+            .get_or_init(|| Mutex::new(HashMap::new()))
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner());
+
+        if let Some(orchestrator) = orchestrators.get(&key) {
+            return Ok(Self {
+                orchestrator: orchestrator.clone(),
+            });
+        }
+
         let maze_config = MazeConfig {
             max_tokens: 2048,
             temperature: 0.7,
@@ -433,10 +569,10 @@ impl Ananke {
             MazeOrchestrator::with_config(modal_config, maze_config).map_err(|e| {
                 PyRuntimeError::new_err(format!("Failed to initialize orchestrator: {}", e))
             })?;
+        let orchestrator = Arc::new(orchestrator);
+        orchestrators.insert(key, orchestrator.clone());
 
-        Ok(Self {
-            orchestrator: Arc::new(orchestrator),
-        })
+        Ok(Self { orchestrator })
     }
 
     /// Generate code with constraints using the Modal inference service.
@@ -485,10 +621,11 @@ impl Ananke {
     fn generate<'py>(
         &self,
         py: Python<'py>,
-        request: PyGenerationRequest,
+        request: PyRef<'py, PyGenerationRequest>,
     ) -> PyResult<Bound<'py, PyAny>> {
-        // Convert Python request to Rust request
-        let rust_request = python_request_to_rust(request)?;
+        // Convert Python request to Rust request straight from the borrowed
+        // object, without first deep-copying it into an owned wrapper
+        let rust_request = python_request_to_rust(&request)?;
 
         // Clone orchestrator for move into async block
         let orch = self.orchestrator.clone();
@@ -506,6 +643,47 @@ impl Ananke {
         })
     }
 
+    /// Generate code with constraints, yielding output as it is produced.
+    ///
+    /// Unlike `generate`, which resolves only once the whole completion is
+    /// available, this returns an async iterator of `PyStreamChunk` objects
+    /// from the Modal streaming endpoint, so the first tokens can be shown
+    /// immediately.
+    ///
+    /// Args:
+    ///     request (PyGenerationRequest): Generation request with prompt, constraints, and parameters.
+    ///
+    /// Returns:
+    ///     PyGenerationStream: Async iterator of chunks, each with:
+    ///         - text (str): The newly generated text
+    ///         - is_final (bool): Whether this is the last chunk
+    ///         - token_index (int): Position of the chunk in the stream
+    ///         - timestamp_ms (int): Milliseconds since the response headers arrived
+    ///           (excludes connection setup, queueing and prefill)
+    ///
+    /// Raises:
+    ///     RuntimeError: During iteration, if the stream cannot be started or is interrupted
+    ///
+    /// Example (Python):
+    ///     ```
+    ///     # async for chunk in ananke.stream_generate(request):
+    ///     #     print(chunk.text, end="", flush=True)
+    ///     ```
+    fn stream_generate(
+        &self,
+        request: PyRef<'_, PyGenerationRequest>,
+    ) -> PyResult<PyGenerationStream> {
+        let rust_request = python_request_to_rust(&request)?;
+
+        Ok(PyGenerationStream {
+            orchestrator: self.orchestrator.clone(),
+            state: Arc::new(tokio::sync::Mutex::new(StreamState {
+                request: Some(rust_request),
+                stream: None,
+            })),
+        })
+    }
+
     /// Compile constraints to llguidance format
     ///
     /// Args:
@@ -522,21 +700,7 @@ impl Ananke {
         constraints: Vec<PyConstraintIR>,
     ) -> PyResult<Bound<'py, PyAny>> {
         // Convert Python constraints to Rust constraints
-        let rust_constraints: Vec<ConstraintIR> = constraints
-            .iter()
-            .map(|py_c| ConstraintIR {
-                name: py_c.name.clone(),
-                json_schema: None,
-                grammar: None,
-                regex_patterns: vec![],
-                token_masks: None,
-                type_inhabitation: None,
-                priority: 2,
-                rich_context: None,
-                feasibility_score: 0.0,
-                is_feasible: true,
-            })
-            .collect();
+        let rust_constraints = python_constraints_for_compile(&constraints);
 
         let orch = self.orchestrator.clone();
 
@@ -549,12 +713,52 @@ impl Ananke {
                 })?;
 
             //  Return as Python dict
+            let result = Python::attach(|py| compiled_to_python(py, &compiled))?;
+
+            Ok(result)
+        })
+    }
+
+    /// Compile several independent constraint sets in a single call
+    ///
+    /// Equivalent to awaiting compile_constraints() once per set, but crosses
+    /// the Python/Rust boundary and schedules one coroutine for the whole batch.
+    ///
+    /// Args:
+    ///     batches: List of constraint lists; each inner list is compiled as one set
+    ///
+    /// Returns:
+    ///     List of dicts in the same order as `batches`, each shaped like the
+    ///     result of compile_constraints()
+    ///
+    /// Raises:
+    ///     RuntimeError: If compilation of any set fails
+    fn compile_constraints_many<'py>(
+        &self,
+        py: Python<'py>,
+        batches: Vec<Vec<PyConstraintIR>>,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let rust_batches: Vec<Vec<ConstraintIR>> = batches
+            .iter()
+            .map(|constraints| python_constraints_for_compile(constraints))
+            .collect();
+
+        let orch = self.orchestrator.clone();
+
+        future_into_py(py, async move {
+            let compiled = orch
+                .compile_constraints_batch(&rust_batches)
+                .await
+                .map_err(|e| {
+                    PyRuntimeError::new_err(format!("Failed to compile constraints: {}", e))
+                })?;
+
             let result = Python::attach(|py| -> PyResult<Py<PyAny>> {
-                let dict = PyDict::new(py);
-                dict.set_item("hash", compiled.hash)?;
-                dict.set_item("compiled_at", compiled.compiled_at)?;
-                dict.set_item("schema", compiled.llguidance_schema.to_string())?;
-                Ok(dict.into())
+                let list = PyList::empty(py);
+                for item in &compiled {
+                    list.append(compiled_to_python(py, item)?)?;
+                }
+                Ok(list.into())
             })?;
 
             Ok(result)
@@ -581,6 +785,9 @@ impl Ananke {
 
     /// Clear the constraint compilation cache
     ///
+    /// Instances from `from_env` with the same environment share one cache,
+    /// so clearing it through one clears it for all of them.
+    ///
     /// Returns:
     ///     None
     fn clear_cache<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
@@ -622,106 +829,122 @@ impl Ananke {
 
 // Helper functions for type conversion
 
-fn python_request_to_rust(py_req: PyGenerationRequest) -> PyResult<GenerationRequest> {
-    let constraints_ir: Vec<ConstraintIR> = py_req
-        .constraints_ir
-        .iter()
-        .map(|py_c| {
-            // Parse JSON schema from Python string if provided
-            let json_schema = py_c.json_schema.as_ref().and_then(|schema_str| {
-                serde_json::from_str::<serde_json::Value>(schema_str)
-                    .ok()
-                    .map(|value| crate::ffi::JsonSchema {
-                        schema_type: value
-                            .get("type")
-                            .and_then(|t| t.as_str())
-                            .unwrap_or("object")
-                            .to_string(),
-                        properties: value
-                            .get("properties")
-                            .and_then(|p| p.as_object())
-                            .map(|obj| obj.iter().map(|(k, v)| (k.clone(), v.clone())).collect())
-                            .unwrap_or_default(),
-                        required: value
-                            .get("required")
-                            .and_then(|r| r.as_array())
-                            .map(|arr| {
-                                arr.iter()
-                                    .filter_map(|v| v.as_str().map(String::from))
-                                    .collect()
-                            })
-                            .unwrap_or_default(),
-                        additional_properties: value
-                            .get("additionalProperties")
-                            .and_then(|a| a.as_bool())
-                            .unwrap_or(true),
+fn python_constraints_for_compile(constraints: &[PyConstraintIR]) -> Vec<ConstraintIR> {
+    constraints.iter().map(python_constraint_to_rust).collect()
+}
+
+fn compiled_to_python(py: Python<'_>, compiled: &CompiledConstraint) -> PyResult<Py<PyAny>> {
+    let dict = PyDict::new(py);
+    dict.set_item("hash", &compiled.hash)?;
+    dict.set_item("compiled_at", compiled.compiled_at)?;
+    dict.set_item("schema", compiled.llguidance_schema.to_string())?;
+    Ok(dict.into())
+}
+
+/// Convert a Python constraint into the Rust IR, parsing its JSON schema and
+/// grammar strings. Unparseable schemas or grammars are dropped.
+fn python_constraint_to_rust(py_c: &PyConstraintIR) -> ConstraintIR {
+    // Parse JSON schema from Python string if provided
+    let json_schema = py_c.json_schema.as_ref().and_then(|schema_str| {
+        serde_json::from_str::<serde_json::Value>(schema_str)
+            .ok()
+            .map(|value| crate::ffi::JsonSchema {
+                schema_type: value
+                    .get("type")
+                    .and_then(|t| t.as_str())
+                    .unwrap_or("object")
+                    .to_string(),
+                properties: value
+                    .get("properties")
+                    .and_then(|p| p.as_object())
+                    .map(|obj| obj.iter().map(|(k, v)| (k.clone(), v.clone())).collect())
+                    .unwrap_or_default(),
+                required: value
+                    .get("required")
+                    .and_then(|r| r.as_array())
+                    .map(|arr| {
+                        arr.iter()
+                            .filter_map(|v| v.as_str().map(String::from))
+                            .collect()
                     })
-            });
+                    .unwrap_or_default(),
+                additional_properties: value
+                    .get("additionalProperties")
+                    .and_then(|a| a.as_bool())
+                    .unwrap_or(true),
+            })
+    });
 
-            // Parse grammar from Python string if provided
-            // Expected format: JSON with { "rules": [...], "start_symbol": "..." }
-            let grammar = py_c.grammar.as_ref().and_then(|grammar_str| {
-                serde_json::from_str::<serde_json::Value>(grammar_str)
-                    .ok()
-                    .and_then(|value| {
-                        let rules = value
-                            .get("rules")?
-                            .as_array()?
-                            .iter()
-                            .filter_map(|rule| {
-                                Some(crate::ffi::GrammarRule {
-                                    lhs: rule.get("lhs")?.as_str()?.to_string(),
-                                    rhs: rule
-                                        .get("rhs")?
-                                        .as_array()?
-                                        .iter()
-                                        .filter_map(|r| r.as_str().map(String::from))
-                                        .collect(),
-                                })
-                            })
-                            .collect();
-                        let start_symbol = value.get("start_symbol")?.as_str()?.to_string();
-                        Some(crate::ffi::Grammar {
-                            rules,
-                            start_symbol,
+    // Parse grammar from Python string if provided
+    // Expected format: JSON with { "rules": [...], "start_symbol": "..." }
+    let grammar = py_c.grammar.as_ref().and_then(|grammar_str| {
+        serde_json::from_str::<serde_json::Value>(grammar_str)
+            .ok()
+            .and_then(|value| {
+                let rules = value
+                    .get("rules")?
+                    .as_array()?
+                    .iter()
+                    .filter_map(|rule| {
+                        Some(crate::ffi::GrammarRule {
+                            lhs: rule.get("lhs")?.as_str()?.to_string(),
+                            rhs: rule
+                                .get("rhs")?
+                                .as_array()?
+                                .iter()
+                                .filter_map(|r| r.as_str().map(String::from))
+                                .collect(),
                         })
                     })
-            });
-
-            // Convert regex patterns from Python strings
-            let regex_patterns: Vec<crate::ffi::RegexPattern> = py_c
-                .regex_patterns
-                .iter()
-                .map(|pattern| crate::ffi::RegexPattern {
-                    pattern: pattern.clone(),
-                    flags: String::new(),
+                    .collect();
+                let start_symbol = value.get("start_symbol")?.as_str()?.to_string();
+                Some(crate::ffi::Grammar {
+                    rules,
+                    start_symbol,
                 })
-                .collect();
-
-            ConstraintIR {
-                name: py_c.name.clone(),
-                json_schema,
-                grammar,
-                regex_patterns,
-                token_masks: None,
-                type_inhabitation: None,
-                priority: 2,
-                rich_context: None,
-                feasibility_score: 0.0,
-                is_feasible: true,
-            }
+            })
+    });
+
+    // Convert regex patterns from Python strings
+    let regex_patterns: Vec<crate::ffi::RegexPattern> = py_c
+        .regex_patterns
+        .iter()
+        .map(|pattern| crate::ffi::RegexPattern {
+            pattern: pattern.clone(),
+            flags: String::new(),
         })
         .collect();
 
-    let context = py_req.context.map(|py_ctx| GenerationContext {
-        current_file: py_ctx.current_file,
-        language: py_ctx.language,
-        project_root: py_ctx.project_root,
+    ConstraintIR {
+        name: py_c.name.clone(),
+        json_schema,
+        grammar,
+        regex_patterns,
+        token_masks: None,
+        type_inhabitation: None,
+        priority: 2,
+        rich_context: None,
+        feasibility_score: 0.0,
+        is_feasible: true,
+    }
+}
+
+fn python_request_to_rust(py_req: &PyGenerationRequest) -> PyResult<GenerationRequest> {
+    let constraints_ir: Vec<ConstraintIR> = py_req
+        .constraints_ir
+        .iter()
+        .map(python_constraint_to_rust)
+        .collect();
+
+    let context = py_req.context.as_ref().map(|py_ctx| GenerationContext {
+        current_file: py_ctx.current_file.clone(),
+        language: py_ctx.language.clone(),
+        project_root: py_ctx.project_root.clone(),
         metadata: HashMap::new(),
     });
 
     Ok(GenerationRequest {
-        prompt: py_req.prompt,
+        prompt: py_req.prompt.clone(),
         constraints_ir,
         max_tokens: py_req.max_tokens,
         temperature: py_req.temperature,
@@ -764,5 +987,7 @@ fn ananke(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PyProvenance>()?;
     m.add_class::<PyValidationResult>()?;
     m.add_class::<PyGenerationMetadata>()?;
+    m.add_class::<PyStreamChunk>()?;
+    m.add_class::<PyGenerationStream>()?;
     Ok(())
 }
@@ -228,3 +228,128 @@ fn test_cache_stats_structure() {
     assert_eq!(stats.size, 10);
     assert_eq!(stats.limit, 100);
 }
+
+#[tokio::test]
+async fn test_compile_constraints_batch() {
+    let config = ModalConfig::new(
+        "https://test.modal.run".to_string(),
+        "test-model".to_string(),
+    );
+    let orchestrator = MazeOrchestrator::new(config).unwrap();
+
+    let constraint = |name: &str| ConstraintIR {
+        name: name.to_string(),
+        json_schema: None,
+        grammar: None,
+        regex_patterns: vec![],
+        token_masks: None,
+        priority: 1,
+        rich_context: None,
+        feasibility_score: 0.0,
+        is_feasible: true,
+        type_inhabitation: None,
+    };
+
+    let batches = vec![
+        vec![constraint("first")],
+        vec![constraint("second")],
+        vec![constraint("first")],
+    ];
+
+    let results = orchestrator
+        .compile_constraints_batch(&batches)
+        .await
+        .unwrap();
+
+    // Results are in input order and identical sets share a hash and cache entry
+    assert_eq!(results.len(), 3);
+    assert_eq!(results[0].hash, results[2].hash);
+    assert_ne!(results[0].hash, results[1].hash);
+    assert_eq!(orchestrator.cache_stats().await.size, 2);
+}
+
+#[test]
+fn test_cache_key_ignores_schema_property_order() {
+    use maze::ffi::JsonSchema;
+
+    let config = ModalConfig::new(
+        "https://test.modal.run".to_string(),
+        "test-model".to_string(),
+    );
+    let orchestrator = MazeOrchestrator::new(config).unwrap();
+
+    let with_properties = |order: &[&str]| {
+        let properties: HashMap<String, serde_json::Value> = order
+            .iter()
+            .map(|name| (name.to_string(), serde_json::json!({"type": "string"})))
+            .collect();
+        ConstraintIR {
+            name: "schema".to_string(),
+            json_schema: Some(JsonSchema {
+                schema_type: "object".to_string(),
+                properties,
+                required: vec![],
+                additional_properties: true,
+            }),
+            grammar: None,
+            regex_patterns: vec![],
+            token_masks: None,
+            priority: 1,
+            rich_context: None,
+            feasibility_score: 0.0,
+            is_feasible: true,
+            type_inhabitation: None,
+        }
+    };
+
+    let forward = with_properties(&["a", "b", "c", "d", "e", "f"]);
+    let reverse = with_properties(&["f", "e", "d", "c", "b", "a"]);
+
+    assert_eq!(
+        orchestrator.generate_cache_key(&[forward]).unwrap(),
+        orchestrator.generate_cache_key(&[reverse]).unwrap()
+    );
+}
+
+#[tokio::test]
+async fn test_persistent_cache_survives_restart() {
+    let cache_dir = tempfile::tempdir().unwrap();
+    let new_orchestrator = || {
+        let config = ModalConfig::new(
+            "https://test.modal.run".to_string(),
+            "test-model".to_string(),
+        );
+        MazeOrchestrator::new(config)
+            .unwrap()
+            .with_persistent_cache(cache_dir.path())
+            .unwrap()
+    };
+
+    let constraints = vec![ConstraintIR {
+        name: "persisted".to_string(),
+        json_schema: None,
+        grammar: None,
+        regex_patterns: vec![],
+        token_masks: None,
+        priority: 1,
+        rich_context: None,
+        feasibility_score: 0.0,
+        is_feasible: true,
+        type_inhabitation: None,
+    }];
+
+    let first = new_orchestrator()
+        .compile_constraints(&constraints)
+        .await
+        .unwrap();
+
+    // A fresh orchestrator starts with an empty in-memory cache but is
+    // served from disk, so the original compilation timestamp is kept
+    let restarted = new_orchestrator();
+    assert_eq!(restarted.cache_stats().await.size, 0);
+    let second = restarted.compile_constraints(&constraints).await.unwrap();
+
+    assert_eq!(first.hash, second.hash);
+    assert_eq!(first.compiled_at, second.compiled_at);
+    assert_eq!(restarted.cache_stats().await.size, 1);
+}